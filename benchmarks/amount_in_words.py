@@ -0,0 +1,56 @@
+"""Micro-benchmark: utils.helpers.amount_in_words against num2words.
+
+    python -m benchmarks.amount_in_words [--count 100000]
+
+Checks that both produce identical text for every sampled amount, then reports calls per
+second for num2words, the native converter with an empty cache, and with a warm cache.
+"""
+import argparse
+import random
+import time
+from num2words import num2words
+from utils.helpers import amount_in_words
+
+
+def sample_amounts(count, seed_value=42):
+    """Bill-like amounts: whole rupees up to 10 crore, with a few paise values and repeats."""
+    rng = random.Random(seed_value)
+    amounts = []
+    for _ in range(count):
+        kind = rng.random()
+        if kind < 0.7:
+            amounts.append(float(rng.randrange(0, 10 ** 9)))
+        elif kind < 0.9:
+            amounts.append(rng.randrange(0, 10 ** 8) / 100)
+        else:
+            amounts.append(float(rng.randrange(1, 500) * 1000)) # Round figures repeat often
+    return amounts
+
+
+def rate(function, amounts):
+    start = time.perf_counter()
+    for amount in amounts:
+        function(amount)
+    return len(amounts) / (time.perf_counter() - start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100000)
+    args = parser.parse_args(argv)
+
+    amounts = sample_amounts(args.count)
+    mismatches = [a for a in amounts if amount_in_words.__wrapped__(a) != num2words(a, lang='en_IN').title()]
+    print(f"{len(amounts)} amounts, {len(mismatches)} mismatches against num2words")
+
+    reference = rate(lambda a: num2words(a, lang='en_IN').title(), amounts)
+    amount_in_words.cache_clear()
+    cold = rate(amount_in_words, amounts)
+    warm = rate(amount_in_words, amounts)
+    print(f"num2words:            {reference:12,.0f} calls/s")
+    print(f"native (empty cache): {cold:12,.0f} calls/s ({cold / reference:.1f}x)")
+    print(f"native (warm cache):  {warm:12,.0f} calls/s ({warm / reference:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Benchmark: PDF register rendering (pages.reports.create_pdf_report) in rows per second.
+
+    python -m benchmarks.pdf_report [--rows 1000 10000 30000]
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from pages.reports import create_pdf_report
+
+
+def sample_register(rows, seed_value=42):
+    """A Payment Register shaped frame as show_reports passes it (dates already formatted)."""
+    rng = np.random.default_rng(seed_value)
+    dates = pd.Timestamp("2024-04-01") + pd.to_timedelta(rng.integers(0, 365, rows), unit="D")
+    return pd.DataFrame({
+        "Bill No": np.arange(1, rows + 1),
+        "Date": dates.strftime("%d/%m/%Y"),
+        "Payee": [f"Contractor {i % 200:04d}" for i in range(rows)],
+        "Work": [f"WC-{i % 500:05d}" for i in range(rows)],
+        "Amount": rng.integers(1, 500, rows) * 1000.0,
+        "Status": rng.choice(["Pending", "Paid"], rows),
+    })
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 30000])
+    args = parser.parse_args(argv)
+
+    create_pdf_report(sample_register(10), "Warm-up") # Font parsing and imports
+    for rows in args.rows:
+        data = sample_register(rows)
+        start = time.perf_counter()
+        pdf_bytes = create_pdf_report(data, "Payment Register Report")
+        elapsed = time.perf_counter() - start
+        print(f"{rows:>8,} rows: {elapsed:7.2f}s  {rows / elapsed:10,.0f} rows/s  {len(pdf_bytes) / 1024:10,.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+import datetime
+from utils.db import (
+    get_contractors, get_budget_index, get_work_details_from_works_plan,
+    load_concurrently, warm_works_plan_index, warm_budget_plan, warm_budget_np, insert_bills, PartialInsertError
+)
+from utils.helpers import amount_in_words, calculate_deductions_frame, DEDUCTION_AMOUNT_COLUMNS
+
+# Sheet columns and the value used when a column or cell is left empty.
+# Rates default to the Create Bill form defaults; CGST/SGST default to 1% where GST applies.
+BULK_BILL_COLUMNS = {
+    "bill_type": "Plan",
+    "major_head": "",
+    "scheme": "",
+    "work": "",
+    "nomenclature": "",
+    "payee": "",
+    "billed_amount": 0,
+    "deduct_payments": 0,
+    "restricted_to_amount": None,
+    "income_tax_percent": 2.24,
+    "deposit_percent": 10,
+    "cess_percent": 1,
+    "cgst_percent": None,
+    "sgst_percent": None,
+    "cc_bill": "1st",
+    "final_bill": False,
+}
+REQUIRED_COLUMNS = ["bill_type", "major_head", "scheme", "payee", "billed_amount"]
+TEXT_COLUMNS = ["bill_type", "major_head", "scheme", "work", "nomenclature", "payee", "cc_bill"]
+NUMBER_COLUMNS = [
+    "billed_amount", "deduct_payments", "restricted_to_amount", "income_tax_percent",
+    "deposit_percent", "cess_percent", "cgst_percent", "sgst_percent",
+]
+CC_BILL_OPTIONS = ["1st", "2nd", "3rd", "4th", "5th", "6th", "7th", "8th", "9th", "10th", "11th", "12th"]
+INCOME_TAX_OPTIONS = [0.0, 1.0, 2.0, 2.24]
+GST_ALLOT_THRESHOLD = 250000 # Plan works with Allot Amt at or above this attract CGST/SGST
+
+# Columns written to the bills table (same record as the Create Bill form)
+BILL_RECORD_COLUMNS = [
+    "payee", "payee_id", "work", "work_id", "bill_type", "major_head", "scheme",
+    "billed_amount", "deduct_payments", "payable", "restricted_to_amount",
+    "income_tax_amount", "deposit_amount", "cess_amount", "cgst_amount", "sgst_amount",
+    "income_tax_percent", "deposit_percent", "cess_percent", "cgst_percent", "sgst_percent",
+    "cc_bill", "final_bill", "total_deduction", "net_amount", "amount_in_words",
+    "status", "created_at", "nomenclature",
+]
+
+def bill_sheet_template():
+    """CSV with the expected header row, for users to fill in."""
+    return pd.DataFrame(columns=list(BULK_BILL_COLUMNS)).to_csv(index=False).encode("utf-8")
+
+def read_bill_sheet(uploaded_file):
+    """Reads an uploaded CSV or Excel sheet into a frame with every BULK_BILL_COLUMNS column."""
+    if uploaded_file.name.lower().endswith(".csv"):
+        sheet = pd.read_csv(uploaded_file, dtype=str, keep_default_na=False)
+    else:
+        sheet = pd.read_excel(uploaded_file, dtype=str, keep_default_na=False)
+    sheet.columns = [str(column).strip() for column in sheet.columns]
+    sheet = sheet.reset_index(drop=True)
+    # Spreadsheets often carry formatted but empty rows after the data
+    filled = sheet.fillna("").astype(str).apply(lambda column: column.str.strip()).ne("").any(axis=1)
+    sheet = sheet.iloc[:filled[filled].index.max() + 1 if filled.any() else 0]
+
+    for column, default in BULK_BILL_COLUMNS.items():
+        if column not in sheet.columns:
+            sheet[column] = default
+    for column in TEXT_COLUMNS:
+        sheet[column] = sheet[column].fillna("").astype(str).str.strip()
+        sheet[column] = sheet[column].mask(sheet[column] == "", BULK_BILL_COLUMNS[column] or "")
+    for column in NUMBER_COLUMNS:
+        values = sheet[column].astype(str).str.replace(",", "").str.strip()
+        numbers = pd.to_numeric(values, errors="coerce")
+        if BULK_BILL_COLUMNS[column] is not None:
+            numbers = numbers.mask(values.isin(["", "None", "nan"]), BULK_BILL_COLUMNS[column])
+        sheet[column] = numbers.astype("float64")
+    sheet["final_bill"] = sheet["final_bill"].astype(str).str.strip().str.lower().isin(["true", "yes", "y", "1"])
+    return sheet
+
+def _limit(detail, key):
+    """Numeric limit from a works_plan/budget row (ignored unless stored as a number, as in the form)."""
+    value = (detail or {}).get(key)
+    return float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else np.nan
+
+def prepare_bills(sheet, contractors, budget_index):
+    """Resolves, validates and prices every sheet row.
+
+    Returns the bill records (BILL_RECORD_COLUMNS) plus an 'errors' column holding the list of
+    problems for each row; rows with an empty list are ready to insert.
+    """
+    bills = sheet.copy()
+    errors = [[] for _ in range(len(bills))]
+
+    def flag(mask, message):
+        for position in np.flatnonzero(np.asarray(mask, dtype=bool)):
+            errors[position].append(message)
+
+    for column in REQUIRED_COLUMNS:
+        if column in TEXT_COLUMNS:
+            flag(bills[column] == "", f"{column} is required")
+        else:
+            flag(bills[column].isna(), f"{column} is required (number)")
+    flag(~bills["bill_type"].isin(["Plan", "Non Plan"]), "bill_type must be 'Plan' or 'Non Plan'")
+    flag(~bills["cc_bill"].isin(CC_BILL_OPTIONS), f"cc_bill must be one of {', '.join(CC_BILL_OPTIONS)}")
+    flag(bills["deduct_payments"].isna(), "deduct_payments must be a number")
+    is_plan = (bills["bill_type"] == "Plan").to_numpy()
+
+    # Payees: one dict lookup per row
+    contractors_by_name = {str(c.get("name", "")).strip(): c for c in contractors}
+    payee_data = bills["payee"].map(contractors_by_name)
+    flag(payee_data.isna() & (bills["payee"] != ""), "payee not found in Contractors")
+    flag(payee_data.map(lambda c: isinstance(c, dict) and not c.get("account_no")), "payee has no Account No")
+    bills["payee_id"] = pd.Series([c.get("id") if isinstance(c, dict) else None for c in payee_data], index=bills.index, dtype=object)
+
+    # Budget nodes: resolved once per distinct (bill type, major head, scheme)
+    budget_keys = list(zip(bills["bill_type"], bills["major_head"], bills["scheme"]))
+    budget_nodes = {key: budget_index.get(key[0], {}).get(key[1], {}).get(key[2]) for key in set(budget_keys)}
+    scheme_node = pd.Series([budget_nodes[key] for key in budget_keys], index=bills.index, dtype=object)
+    flag(scheme_node.isna() & (bills["major_head"] != "") & (bills["scheme"] != ""),
+         "major_head/scheme not found in the budget for this bill_type")
+    budget_entry = scheme_node.map(lambda node: node["entry"] if node else None)
+
+    # Plan works: the Workcode must be listed under the budget node; details come from the works_plan index
+    workcodes_by_node = {
+        key: {code.lower(): code for code in node["workcodes"]} for key, node in budget_nodes.items() if node
+    }
+    work_key = bills["work"].str.lower()
+    bills["work"] = [
+        workcodes_by_node.get(key, {}).get(code, work) if plan else "N/A"
+        for key, code, work, plan in zip(budget_keys, work_key, bills["work"], is_plan)
+    ]
+    flag(is_plan & (work_key == ""), "work (Workcode) is required for Plan bills")
+    flag(is_plan & scheme_node.notna() & (work_key != "")
+         & ~pd.Series([code in workcodes_by_node.get(key, {}) for key, code in zip(budget_keys, work_key)], index=bills.index),
+         "work (Workcode) is not listed under this major_head/scheme")
+
+    details_by_workcode = {code: get_work_details_from_works_plan(code) for code in set(bills["work"][is_plan]) if code}
+    work_data = []
+    for position, (plan, code, nomenclature) in enumerate(zip(is_plan, bills["work"], bills["nomenclature"])):
+        detail = None
+        if plan and code:
+            candidates = details_by_workcode.get(code, [])
+            if nomenclature:
+                detail = next((item for item in candidates if str(item.get("Nomenclature") or "").strip() == nomenclature), None)
+                if candidates and not detail:
+                    errors[position].append("nomenclature not found for this Workcode")
+            elif len({str(item.get("Nomenclature") or "").strip() for item in candidates}) == 1:
+                detail = candidates[0]
+            elif candidates:
+                errors[position].append("nomenclature is required (several found for this Workcode)")
+            if not candidates:
+                errors[position].append("no details found in works_plan for this Workcode")
+        work_data.append(detail)
+    bills["work_id"] = pd.Series([detail.get("id") if detail else None for detail in work_data], index=bills.index, dtype=object)
+    bills["nomenclature"] = [detail.get("Nomenclature", "") if detail else "" for detail in work_data]
+
+    # Sanction limits, compared for all rows at once
+    billed_amount = bills["billed_amount"]
+    for key, label in [("Allot Amt", "Allot Amt"), ("AAA Amt", "AAA Amt"), ("TS Amt", "TS Amt")]:
+        limit = pd.Series([_limit(detail, key) for detail in work_data], index=bills.index)
+        flag(is_plan & (billed_amount > limit), f"billed_amount exceeds {label}")
+    budget_amount = budget_entry.map(lambda entry: _limit(entry, "Amount")).astype("float64")
+    flag(~is_plan & (billed_amount > budget_amount), "billed_amount exceeds Total Budget")
+
+    # Amounts and rates
+    bills["payable"] = billed_amount - bills["deduct_payments"]
+    bills["restricted_to_amount"] = bills["restricted_to_amount"].fillna(bills["payable"])
+    flag(bills["restricted_to_amount"] < 0, "restricted_to_amount must be non-negative")
+    flag(~bills["income_tax_percent"].isin(INCOME_TAX_OPTIONS), "income_tax_percent must be 0, 1, 2 or 2.24")
+    flag(~bills["deposit_percent"].between(0, 100), "deposit_percent must be between 0 and 100")
+    flag(~bills["cess_percent"].between(0, 1), "cess_percent must be between 0 and 1")
+
+    allot_amount = pd.Series([_limit(detail, "Allot Amt") for detail in work_data], index=bills.index)
+    apply_gst = is_plan & (allot_amount >= GST_ALLOT_THRESHOLD).to_numpy()
+    for column in ["cgst_percent", "sgst_percent"]:
+        bills[column] = np.where(apply_gst, bills[column].fillna(1), 0.0)
+        flag(~bills[column].between(0, 1), f"{column} must be between 0 and 1")
+
+    # Deductions for every row in one pass (same rules and rounding as calculate_deductions)
+    bills[DEDUCTION_AMOUNT_COLUMNS] = calculate_deductions_frame(bills)
+
+    # Words once per distinct net amount, only for rows that are otherwise valid
+    words = {}
+    for position, amount in enumerate(bills["net_amount"]):
+        if errors[position]:
+            continue
+        if amount not in words:
+            try:
+                words[amount] = amount_in_words(amount)
+            except Exception:
+                words[amount] = None
+        if words[amount] is None:
+            errors[position].append("net_amount cannot be written in words")
+    bills["amount_in_words"] = bills["net_amount"].map(words)
+
+    bills["status"] = "Pending"
+    bills["created_at"] = datetime.datetime.now().isoformat()
+    return bills[BILL_RECORD_COLUMNS].assign(errors=errors)
+
+def bill_records(bills):
+    """Plain dicts (None for missing values) ready for insert_bills."""
+    records = bills[BILL_RECORD_COLUMNS].astype(object)
+    return records.where(records.notna(), None).to_dict("records")
+
+def bulk_create_bills():
+    st.subheader("📥 Bulk Upload")
+    st.caption(
+        "One bill per row. Bills are checked against the budget, works_plan (Allot/AAA/TS) and "
+        "contractor records before anything is saved; empty rate columns take the form defaults."
+    )
+    st.download_button(
+        "⬇️ Download Template",
+        data=bill_sheet_template(),
+        file_name="bills_template.csv",
+        mime="text/csv",
+    )
+
+    uploaded_file = st.file_uploader("Bills sheet (CSV or Excel)", type=["csv", "xlsx"], key="bulk_bills_file")
+    if not uploaded_file:
+        return
+
+    try:
+        sheet = read_bill_sheet(uploaded_file)
+    except Exception as e:
+        st.error(f"Could not read the sheet: {str(e)}")
+        return
+    if sheet.empty:
+        st.info("The sheet has no rows.")
+        return
+
+    try:
+        reference_data = load_concurrently(
+            contractors=lambda: get_contractors(columns=["id", "name", "account_no"]),
+            budget_plan=warm_budget_plan,
+            budget_np=warm_budget_np,
+            works_plan_index=warm_works_plan_index,
+        )
+        bills = prepare_bills(sheet, reference_data["contractors"] or [], get_budget_index())
+    except Exception as e:
+        st.error(f"Error preparing bills: {str(e)}")
+        return
+
+    valid = bills["errors"].str.len() == 0
+    metric_col1, metric_col2, metric_col3 = st.columns(3)
+    metric_col1.metric("Rows", len(bills))
+    metric_col2.metric("Ready", int(valid.sum()))
+    metric_col3.metric("Net Amount (Ready)", f"₹{bills.loc[valid, 'net_amount'].sum():,.2f}")
+
+    if not valid.all():
+        st.error(f"{int((~valid).sum())} row(s) have problems and will not be saved:")
+        problems = pd.DataFrame({
+            "Sheet Row": bills.index[~valid] + 2, # header is row 1
+            "Payee": bills.loc[~valid, "payee"],
+            "Problems": bills.loc[~valid, "errors"].str.join("; "),
+        })
+        st.dataframe(problems, use_container_width=True, hide_index=True)
+
+    st.dataframe(
+        bills.loc[valid, ["payee", "bill_type", "major_head", "scheme", "work", "billed_amount",
+                          "restricted_to_amount", "total_deduction", "net_amount"]],
+        use_container_width=True,
+        hide_index=True,
+    )
+
+    # Guard against saving the same upload twice across reruns. A save that fails part way
+    # leaves the rows it stored listed under bulk_bills_saved_rows, and they are skipped after.
+    already_saved = st.session_state.get("bulk_bills_saved") == uploaded_file.file_id
+    saved_file, saved_rows = st.session_state.get("bulk_bills_saved_rows", (None, []))
+    saved_rows = saved_rows if saved_file == uploaded_file.file_id else []
+    pending = valid & ~bills.index.isin(saved_rows)
+    if already_saved:
+        st.info("These bills have already been saved.")
+    elif saved_rows:
+        st.info(f"{len(saved_rows)} of these bills were saved before the last error and will not be saved again.")
+    if st.button(f"💾 Create {int(pending.sum())} Bills", type="primary", disabled=already_saved or not pending.any()):
+        to_save = bills[pending]
+        try:
+            inserted = insert_bills(bill_records(to_save))
+            if inserted is None:
+                st.error("❌ Failed to save bills to database.")
+            else:
+                st.session_state.bulk_bills_saved = uploaded_file.file_id
+                st.session_state.pop("bulk_bills_saved_rows", None)
+                st.success(f"✅ {len(inserted) + len(saved_rows)} bills created successfully!")
+                st.balloons()
+        except PartialInsertError as e:
+            # Rows are inserted in order, so the stored ones are the first len(e.inserted)
+            saved_rows = saved_rows + to_save.index[:len(e.inserted)].tolist()
+            st.session_state.bulk_bills_saved_rows = (uploaded_file.file_id, saved_rows)
+            st.error(f"❌ Error saving bills: {str(e.__cause__)}. {len(e.inserted)} bills were saved; "
+                     "saving again creates only the rest.")
+        except Exception as e:
+            st.error(f"❌ Error saving bills: {str(e)}")
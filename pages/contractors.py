@@ -11,7 +11,7 @@ def contractor_management():
 
     with list_tab:
         try:
-            contractors = get_contractors()
+            contractors = get_contractors(columns=["name", "class", "account_no", "pan"])
             if contractors:
                 df = pd.DataFrame(contractors)[["name", "class", "account_no", "pan"]]
                 st.dataframe(
@@ -63,7 +63,6 @@ def contractor_management():
                         })
                         st.success("Contractor added successfully!")
                         st.balloons()
-                        st.cache_data.clear()
                         st.rerun()
                     except Exception as e:
                         st.error(f"Database error: {str(e)}")
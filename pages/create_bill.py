@@ -2,19 +2,42 @@ import streamlit as st
 import datetime
 from utils.db import (
     get_contractors, get_works, insert_bill, 
-    get_budget_np, get_budget_plan, get_work_details_from_works_plan # Import new functions
+    get_budget_index, get_work_details_from_works_plan, # Import new functions
+    load_concurrently, warm_works_plan_index, warm_budget_plan, warm_budget_np
 )
 from utils.helpers import amount_in_words, calculate_deductions
 
 def create_new_bill():
     st.header("📝 Create New Bill")
 
+    # Year-end batches are uploaded as a sheet instead of going through the form one at a time
+    entry_mode = st.radio(
+        "Entry Mode",
+        options=["Single Bill", "Bulk Upload"],
+        horizontal=True,
+        key="create_bill_mode",
+        label_visibility="collapsed"
+    )
+    if entry_mode == "Bulk Upload":
+        from pages.bulk_bills import bulk_create_bills
+        bulk_create_bills()
+        return
+
     # Load data with error handling
     try:
-        contractors = get_contractors()
-        works = get_works()
-        budget_np = get_budget_np()
-        budget_plan = get_budget_plan()
+        # Issue the reference reads in parallel; also warm the Workcode index used below
+        reference_data = load_concurrently(
+            contractors=lambda: get_contractors(columns=[
+                "id", "name", "parentage", "resident", "class", "registration", "pan", "gstin", "account_no"
+            ]),
+            works=lambda: get_works(columns=["id"]), # Only checked for availability here
+            budget_plan=warm_budget_plan,
+            budget_np=warm_budget_np,
+            works_plan_index=warm_works_plan_index,
+        )
+        contractors = reference_data["contractors"]
+        works = reference_data["works"]
+        budget_index = get_budget_index() # Built from the budget reads above
 
         # Check if essential data loaded
         if not contractors:
@@ -26,12 +49,10 @@ def create_new_bill():
             # return # Or decide if works are absolutely essential upfront
 
         # Check budget data (optional, depending on workflow)
-        if not budget_np:
+        if not budget_index["Non Plan"]:
             st.warning("Could not load Non-Plan Budget data.")
-            budget_np = [] # Ensure it's an empty list if loading failed
-        if not budget_plan:
+        if not budget_index["Plan"]:
             st.warning("Could not load Plan Budget data.")
-            budget_plan = [] # Ensure it's an empty list if loading failed
 
     except Exception as e:
         st.error(f"Database error: {str(e)}")
@@ -59,28 +80,18 @@ def create_new_bill():
 
         # --- Determine budget source and populate dependent dropdowns OUTSIDE form ---
 
-        # 1. Determine Source Budget Table based on Bill Type
-        source_budget_table = []
-        major_head_column = 'Major Head' # Assuming same name in both tables
-        scheme_column = None
+        # 1. Determine the budget tree based on Bill Type
+        # (major head -> scheme/detailed head -> {entry, workcodes}, keys already sorted)
+        source_budget_tree = budget_index.get(bill_type, {})
         scheme_label = "Scheme/Detailed Head*"
 
         if bill_type == "Plan":
-            source_budget_table = budget_plan
-            scheme_column = 'Scheme'
             scheme_label = "Scheme*"
         elif bill_type == "Non Plan":
-            source_budget_table = budget_np
-            scheme_column = 'Detailed Head'
             scheme_label = "Detailed Head*"
 
-        # 2. Populate Major Heads based on the determined source table
-        major_heads_options = []
-        if source_budget_table:
-            major_heads_options = sorted(list(set(item.get(major_head_column) for item in source_budget_table if item.get(major_head_column))))
-
-        # Add empty option at the beginning
-        major_heads_options = [""] + major_heads_options
+        # 2. Populate Major Heads from the tree; add empty option at the beginning
+        major_heads_options = [""] + list(source_budget_tree)
 
         major_head = st.selectbox(
             "Major Head*",
@@ -93,9 +104,8 @@ def create_new_bill():
 
     with col_bill_details_2:
         # 3. Populate Scheme/Detailed Head based on selected Major Head
-        scheme_options = []
-        if major_head and source_budget_table and scheme_column:
-            scheme_options = sorted(list(set(item.get(scheme_column) for item in source_budget_table if item.get(major_head_column) == major_head and item.get(scheme_column))))
+        schemes_for_major_head = source_budget_tree.get(major_head, {}) if major_head else {}
+        scheme_options = list(schemes_for_major_head)
 
         scheme = st.selectbox(
             scheme_label, # Dynamic label
@@ -109,33 +119,14 @@ def create_new_bill():
         work_disabled = False
         work_selected_value = None # Store the actual selected value
 
+        # Budget node for the selected Major Head and Scheme/Detailed Head (None until both are chosen)
+        scheme_node = schemes_for_major_head.get(scheme) if scheme else None
+
         if bill_type == "Plan":
             work_disabled = False # Enable for Plan
-            if major_head and scheme and budget_plan:
-                # Filter budget_plan for matching MH and Scheme, then get unique 'work' values
-                # Filter budget_plan for matching MH and Scheme, then get unique 'work' values
-                # Filter budget_plan for matching MH and Scheme, then get unique 'work' values
-                # Filter budget_plan for matching MH and Scheme, then get unique 'work' values
-                plan_works = set()
-
-                for item in budget_plan:
-                    item_major_head = item.get(major_head_column)
-                    item_scheme = item.get(scheme_column)
-                    # Corrected: Use 'Workcode' to match the new column name
-                    item_work = item.get('Workcode')
-
-                    # Perform case-insensitive comparison and strip spaces
-                    major_head_match = (item_major_head and major_head and
-                                        str(item_major_head).strip().lower() == str(major_head).strip().lower())
-                    scheme_match = (item_scheme and scheme and
-                                    str(item_scheme).strip().lower() == str(scheme).strip().lower())
-
-                    # Updated condition to use the variable with the correct work value
-                    if (major_head_match and scheme_match and
-                        item_work and isinstance(item_work, str) and item_work.strip()): # Check if 'work' key exists, is a string, and has a non-empty value after stripping
-                        plan_works.add(item_work.strip()) # Add stripped work value
-
-                work_options = sorted(list(plan_works))
+            if scheme_node:
+                # Workcodes under this Major Head and Scheme (matched case-insensitively when indexed)
+                work_options = list(scheme_node["workcodes"])
 
             # If no options found, provide a placeholder maybe?
             if not work_options:
@@ -238,19 +229,8 @@ def create_new_bill():
             st.markdown(f'<span style="color: blue;">DOS: {selected_nomenclature_detail.get("DOS", "N/A")}</span>', unsafe_allow_html=True)
             st.markdown(f'<span style="color: green;">DOC: {selected_nomenclature_detail.get("DOC", "N/A")}</span>', unsafe_allow_html=True)
 
-    # Determine the selected budget entry based on bill type, major head, and scheme
-    selected_budget_entry = None
-    if major_head and scheme:
-        if bill_type == "Plan":
-            # For Plan, match Major Head and Scheme
-            selected_budget_entry = next((item for item in budget_plan if
-                                           item.get(major_head_column) == major_head and
-                                           item.get(scheme_column) == scheme), None)
-        elif bill_type == "Non Plan":
-            # For Non Plan, match Major Head and Detailed Head
-             selected_budget_entry = next((item for item in budget_np if
-                                           item.get(major_head_column) == major_head and
-                                           item.get(scheme_column) == scheme), None)
+    # The selected budget entry is the first budget row for the chosen major head and scheme
+    selected_budget_entry = scheme_node["entry"] if scheme_node else None
 
 
     # Display Total Budget from the selected budget entry (Moved below Work Details)
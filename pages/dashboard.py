@@ -4,20 +4,130 @@ from datetime import datetime, timedelta
 import inspect
 import os
 import time
-from utils.db import get_contractors, get_works, get_bills
+from utils.archive import get_archived_bills
+from utils.db import (count_rows, count_bills, get_bills_snapshot, get_bill_totals, sync_bills, bump_table_version,
+                      bills_snapshot_version, CACHE_TTL)
 
-# Cache data fetches
-@st.cache_data(ttl=300)
-def fetch_contractors():
-    return get_contractors() or []
+DASHBOARD_BILL_COLUMNS = ["bill_no", "payee", "work", "billed_amount", "status", "created_at"]
+# Expenditure trend resolutions, finest first: (days per point, resample rule labelled by period start).
+# The chart uses the finest one that keeps the range within TREND_MAX_POINTS points.
+TREND_RESOLUTIONS = {
+    "Daily": (1, "D"),
+    "Weekly": (7, "W-MON"),
+    "Monthly": (31, "MS"),
+    "Yearly": (366, "YS-APR"), # fiscal years
+}
+TREND_MAX_POINTS = 400
 
-@st.cache_data(ttl=300)
-def fetch_works():
-    return get_works() or []
+def _day_positions(index, start_date=None, end_date=None):
+    """Positions of [start_date, end_date] (whole days) in a sorted DatetimeIndex, by binary search."""
+    start = index.searchsorted(pd.Timestamp(start_date), "left") if start_date else 0
+    end = index.searchsorted(pd.Timestamp(end_date) + pd.Timedelta(days=1), "left") if end_date else len(index)
+    return start, end
 
-@st.cache_data(ttl=60)
-def fetch_bills():
-    return get_bills() or []
+def _running_difference(running, start, end):
+    """Sum of rows [start, end) of a frame or series, from its cumulative sums."""
+    if end <= start:
+        return running.iloc[0:0].sum()
+    total = running.iloc[end - 1]
+    return total - running.iloc[start - 1] if start else total
+
+class DashboardSnapshot:
+    """Everything the dashboard shows, built once per bills version and shared by all sessions.
+
+    - bills: the table columns of every bill in the database, indexed and sorted by created_at
+    - daily: billed_amount and bill_count per day, from the rollup (archived years included)
+    - status counts: running bill counts per status, one row per day
+    - trends: billed_amount resampled at each of TREND_RESOLUTIONS
+
+    The accessors slice these by binary search on the date index and take range totals from
+    running sums, so a rerun costs the same however many bills there are.
+    """
+
+    def __init__(self, bills, daily_totals):
+        bills = bills.reindex(columns=DASHBOARD_BILL_COLUMNS)
+        bills.index = pd.DatetimeIndex(pd.to_datetime(bills["created_at"]), name=None)
+        self.bills = bills
+
+        status_counts = pd.crosstab(bills.index.normalize(), bills["status"]) if len(bills) else pd.DataFrame()
+        self._status_running = status_counts.cumsum()
+
+        daily = pd.DataFrame(daily_totals, columns=["group_key", "bill_count", "billed_amount"])
+        daily.index = pd.DatetimeIndex(pd.to_datetime(daily.pop("group_key")), name=None)
+        daily = daily.apply(pd.to_numeric, errors="coerce").fillna(0).sort_index()
+        self.daily = daily[["billed_amount", "bill_count"]]
+        self._billed_running = self.daily["billed_amount"].cumsum()
+        self.trends = {
+            resolution: self.daily["billed_amount"].resample(rule, label="left", closed="left").sum()
+            for resolution, (_, rule) in TREND_RESOLUTIONS.items()
+        }
+
+    def bills_between(self, start_date=None, end_date=None):
+        """Bills in the range, newest first. Archived years are read from their files when the
+        range reaches them, once per range until the files change."""
+        start, end = _day_positions(self.bills.index, start_date, end_date)
+        bills = self.bills.iloc[start:end]
+        archived = get_archived_bills(DASHBOARD_BILL_COLUMNS, start_date, end_date)
+        if archived is not None and not archived.empty:
+            archived = archived.reindex(columns=DASHBOARD_BILL_COLUMNS)
+            # Concatenating an empty slice would leave the columns object-typed
+            bills = pd.concat([archived, bills], ignore_index=True) if not bills.empty else archived
+        return bills.iloc[::-1]
+
+    def daily_between(self, start_date=None, end_date=None):
+        start, end = _day_positions(self.daily.index, start_date, end_date)
+        return self.daily.iloc[start:end]
+
+    def trend_between(self, start_date=None, end_date=None, max_points=TREND_MAX_POINTS):
+        """(resolution, billed_amount series) for the range at the finest resolution that fits in
+        max_points. Periods are labelled by their first day; the first and last hold only the
+        days inside the range, so the points add up to billed_between."""
+        if self.daily.empty:
+            return "Daily", self.trends["Daily"]
+        # The span is measured over the days that have data, so an open-ended range is not coarser than needed
+        first = max(pd.Timestamp(start_date), self.daily.index[0]) if start_date else self.daily.index[0]
+        last = min(pd.Timestamp(end_date), self.daily.index[-1]) if end_date else self.daily.index[-1]
+        if last < first:
+            return "Daily", self.trends["Daily"].iloc[0:0]
+        span_days = (last - first).days + 1
+        resolution = next((name for name, (days, _) in TREND_RESOLUTIONS.items() if span_days <= days * max_points),
+                          list(TREND_RESOLUTIONS)[-1])
+        trend = self.trends[resolution]
+        # From the period containing the first day to the last one starting on or before the last day
+        start = max(trend.index.searchsorted(first, "right") - 1, 0)
+        end = trend.index.searchsorted(last, "right")
+        trend = trend.iloc[start:end].copy()
+        if resolution != "Daily" and len(trend):
+            # Clip the edge periods to the range using the daily running sums
+            first_period_end = trend.index[1] - pd.Timedelta(days=1) if len(trend) > 1 else last
+            trend.iloc[0] = self.billed_between(first, first_period_end)
+            if len(trend) > 1:
+                trend.iloc[-1] = self.billed_between(trend.index[-1], last)
+        return resolution, trend
+
+    def billed_between(self, start_date=None, end_date=None):
+        start, end = _day_positions(self._billed_running.index, start_date, end_date)
+        return float(_running_difference(self._billed_running, start, end) or 0)
+
+    def status_counts(self, start_date=None, end_date=None):
+        """Bills per status created in the range (all bills without one), counting archived
+        years the range reaches like bills_between does."""
+        start, end = _day_positions(self._status_running.index, start_date, end_date)
+        counts = _running_difference(self._status_running, start, end)
+        if not isinstance(counts, pd.Series):
+            counts = pd.Series(dtype="int64") # no bills in the database
+        archived = get_archived_bills(DASHBOARD_BILL_COLUMNS, start_date, end_date)
+        if archived is not None and not archived.empty:
+            counts = counts.add(archived["status"].value_counts(), fill_value=0)
+        return counts
+
+# Shared by every session until the bills version changes; treat as read-only
+@st.cache_resource(ttl=CACHE_TTL, max_entries=1, show_spinner=False)
+def _dashboard_snapshot(version):
+    return DashboardSnapshot(get_bills_snapshot(), get_bill_totals("day"))
+
+def dashboard_snapshot():
+    return _dashboard_snapshot(bills_snapshot_version())
 
 def show_dashboard():
     st.header("Dashboard Overview")
@@ -32,7 +142,10 @@ def show_dashboard():
             help="Reload all dashboard data",
             type="primary"
         ):
-            st.cache_data.clear()
+            # Invalidate only the tables shown here; bills fetch only rows past the watermark
+            # (edits made elsewhere arrive with the snapshot's CACHE_TTL reload)
+            bump_table_version("contractors", "works_plan")
+            sync_bills()
             st.rerun()
     
     # Metrics display
@@ -40,25 +153,25 @@ def show_dashboard():
     
     with metric_col1:
         try:
-            contractors = fetch_contractors()
-            st.metric("Total Contractors", len(contractors))
+            # Count-only queries: no rows are transferred for the metrics
+            contractors_count = count_rows("contractors")
+            st.metric("Total Contractors", contractors_count if contractors_count is not None else "N/A")
         except Exception as e:
             st.error(f"Contractor data unavailable")
             st.metric("Total Contractors", "N/A")
 
     with metric_col2:
         try:
-            works = fetch_works()
-            st.metric("Active Works", len(works))
+            works_count = count_rows("works_plan")
+            st.metric("Active Works", works_count if works_count is not None else "N/A")
         except Exception as e:
             st.error(f"Works data unavailable")
             st.metric("Active Works", "N/A")
 
     with metric_col3:
         try:
-            bills = fetch_bills()
-            pending = len([b for b in bills if b.get("status") == "Pending"])
-            st.metric("Pending Bills", pending)
+            pending = count_bills(status="Pending")
+            st.metric("Pending Bills", pending if pending is not None else "N/A")
         except Exception as e:
             st.error(f"Bills data unavailable")
             st.metric("Pending Bills", "N/A")
@@ -81,61 +194,49 @@ def show_dashboard():
     
     with tab1:
         try:
-            bills = fetch_bills()
-            if bills:
-                filtered_bills = [
-                    b for b in bills 
-                    if start_date <= datetime.strptime(b.get('created_at', default_end.isoformat())[:10], "%Y-%m-%d").date() <= end_date
-                ]
-                
-                if filtered_bills:
-                    df = pd.DataFrame(filtered_bills).sort_values('created_at', ascending=False)
-                    columns_to_show = ["bill_no", "payee", "work", "billed_amount", "status", "created_at"]
-                    available_columns = [col for col in columns_to_show if col in df.columns]
-                    
-                    st.dataframe(
-                        df[available_columns],
-                        use_container_width=True,
-                        hide_index=True,
-                        column_config={
-                            "billed_amount": st.column_config.NumberColumn(
-                                "Amount",
-                                format="₹%.2f"
-                            ),
-                            "created_at": st.column_config.DateColumn(
-                                "Date",
-                                format="DD-MM-YYYY"
-                            )
-                        }
-                    )
-                else:
-                    st.info("No bills found in selected date range")
+            # Built once per bills version (cached); inside each tab's try so a missing
+            # rollup function or API error only affects that tab
+            snapshot = dashboard_snapshot()
+            bills = snapshot.bills_between(start_date, end_date)
+            if not bills.empty:
+                status_counts = snapshot.status_counts(start_date, end_date)
+                st.caption(" | ".join(f"{status}: {int(count)}" for status, count in status_counts.items() if count))
+                st.dataframe(
+                    bills,
+                    use_container_width=True,
+                    hide_index=True,
+                    column_config={
+                        "billed_amount": st.column_config.NumberColumn(
+                            "Amount",
+                            format="₹%.2f"
+                        ),
+                        "created_at": st.column_config.DateColumn(
+                            "Date",
+                            format="DD-MM-YYYY"
+                        )
+                    }
+                )
             else:
-                st.info("No bills found in database")
+                st.info("No bills found in selected date range")
         except Exception as e:
             st.error(f"Error displaying bills: {str(e)}")
 
     with tab2:
         try:
-            bills = fetch_bills()
-            if bills:
-                df = pd.DataFrame(bills)
-                df['created_at'] = pd.to_datetime(df['created_at']).dt.date
-                df = df[df['created_at'].between(start_date, end_date)]
-                
-                if not df.empty:
-                    daily_totals = df.groupby('created_at')['billed_amount'].sum().reset_index()
-                    st.area_chart(
-                        daily_totals.set_index('created_at'),
-                        use_container_width=True,
-                        color="#4CAF50"
-                    )
-                    monthly_total = daily_totals['billed_amount'].sum()
-                    st.metric("Total Expenditure in Period", f"₹{monthly_total:,.2f}")
-                else:
-                    st.info("No expenditure data in selected date range")
+            snapshot = dashboard_snapshot()
+            # Precomputed daily/weekly/monthly totals, at most TREND_MAX_POINTS points per chart
+            if not snapshot.daily_between(start_date, end_date).empty:
+                resolution, trend = snapshot.trend_between(start_date, end_date)
+                st.area_chart(
+                    trend.to_frame('billed_amount'),
+                    use_container_width=True,
+                    color="#4CAF50"
+                )
+                st.caption(f"{resolution} totals")
+                monthly_total = snapshot.billed_between(start_date, end_date)
+                st.metric("Total Expenditure in Period", f"₹{monthly_total:,.2f}")
             else:
-                st.info("No bills data available for visualization")
+                st.info("No expenditure data in selected date range")
         except Exception as e:
             st.error(f"Error generating expenditure trends: {str(e)}")
 
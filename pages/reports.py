@@ -1,11 +1,25 @@
 import streamlit as st
 import pandas as pd
 import datetime
+import functools
 import io  # Import io for BytesIO
+import os
+import tempfile
+import threading
+from collections import OrderedDict
 from fpdf import FPDF
-from utils.db import get_bills, get_works
+from utils.db import get_bills, get_bills_snapshot, bills_snapshot_version, get_bill_totals, get_works, table_version, CACHE_TTL
+from utils.archive import read_archived_bills
+from utils.exports import REGISTER_LAYOUTS, write_register_xlsx
 # Remove comp_key import and FormManager instantiation
 
+# Bill columns each bills-based report reads; everything else stays on the server
+REPORT_BILL_COLUMNS = {
+    "Payment Register": ["bill_no", "created_at", "payee", "work", "payable", "status"],
+    "Deduction Register": ["bill_no", "created_at", "payee", "income_tax_amount", "deposit_amount", "cess_amount"],
+}
+
+
 def show_reports():
     st.header("Reports")
     
@@ -150,94 +164,315 @@ def show_reports():
                  st.warning("No data found for the selected criteria")
 
 # --- PDF Generation Helper ---
+REPORT_FONTS = {"": "fonts/DejaVuSans.ttf", "B": "fonts/DejaVuSans-Bold.ttf"}
+CURRENCY_COLUMNS = ["Amount", "Total Amount", "Allocated", "Utilized", "Balance",
+                    "Income Tax", "Deposit", "Cess", "Total Deduction"]
+DATE_COLUMNS = ["Date", "Last Payment Date"]
+PDF_FONT_SIZE = 10
+PDF_CELL_PADDING = 1.5 # mm either side of the text
+
+@functools.lru_cache(maxsize=None)
+def report_font_available():
+    """Checks for the DejaVu files once per process (warning once if they are missing)."""
+    available = all(os.path.exists(path) for path in REPORT_FONTS.values())
+    if not available:
+        st.warning("DejaVu font not found. Using Helvetica for PDF reports (₹ is written as Rs.).")
+    return available
+
+def format_report_columns(df, currency_symbol="₹"):
+    """Returns the report as a frame of display strings, formatting each column in one pass."""
+    formatted = {}
+    for column in df.columns:
+        values = df[column]
+        if column in CURRENCY_COLUMNS:
+            numbers = pd.to_numeric(values, errors="coerce")
+            text = values.astype(object).where(values.notna(), "").astype(str)
+            formatted[column] = text.mask(numbers.notna(), numbers.map(lambda n: f"{currency_symbol}{n:,.2f}", na_action="ignore"))
+        elif column in DATE_COLUMNS and not pd.api.types.is_string_dtype(values):
+            formatted[column] = pd.to_datetime(values, errors="coerce").dt.strftime("%d/%m/%Y").fillna("")
+        else:
+            formatted[column] = values.astype(object).where(values.notna(), "").astype(str)
+    return pd.DataFrame(formatted, index=df.index)
+
 class PDF(FPDF):
+    """Landscape table report. Fonts are added once per document, not on every page."""
+
+    def __init__(self, report_title="", **kwargs):
+        super().__init__(**kwargs)
+        self.report_title = report_title
+        self.font_name = "Helvetica"
+        if report_font_available():
+            for style, path in REPORT_FONTS.items():
+                self.add_font("DejaVu", style, path)
+            self.font_name = "DejaVu"
+        self.table_columns = None # (headers, widths) repeated at the top of each page
+
     def header(self):
-        # Add DejaVu font (assuming it's in the fonts/ directory relative to script execution)
-        try:
-            self.add_font('DejaVu', '', 'fonts/DejaVuSans.ttf', uni=True)
-            self.add_font('DejaVu', 'B', 'fonts/DejaVuSans-Bold.ttf', uni=True)
-            self.set_font('DejaVu', 'B', 12)
-        except RuntimeError:
-            # Fallback if font file not found
-            self.set_font('Arial', 'B', 12)
-            st.warning("DejaVu font not found. Using Arial for PDF header (may affect special characters).")
-
-        # Title - Get title from instance variable
+        self.set_font(self.font_name, 'B', 12)
         self.cell(0, 10, self.report_title, 0, 1, 'C')
         self.ln(5) # Add a little space after the header
 
     def footer(self):
         self.set_y(-15)
-        try:
-            self.set_font('DejaVu', '', 8)
-        except RuntimeError:
-            self.set_font('Arial', '', 8) # Fallback
+        self.set_font(self.font_name, '', 8)
         self.cell(0, 10, f'Page {self.page_no()}', 0, 0, 'C')
 
     def chapter_title(self, title):
-        try:
-            self.set_font('DejaVu', 'B', 12)
-        except RuntimeError:
-            self.set_font('Arial', 'B', 12) # Fallback
+        self.set_font(self.font_name, 'B', 12)
         self.cell(0, 10, title, 0, 1, 'L')
         self.ln(4)
 
+    def column_widths(self, cells):
+        """Widths sized to the longest header/value per column, fitted to the page width."""
+        widths = []
+        for column in cells.columns:
+            lengths = cells[column].str.len()
+            longest = cells[column][lengths >= lengths.max()].head(3) if len(cells) else []
+            self.set_font(self.font_name, '', PDF_FONT_SIZE)
+            width = max((self.get_string_width(text) for text in longest), default=0)
+            self.set_font(self.font_name, 'B', PDF_FONT_SIZE)
+            widths.append(max(width, self.get_string_width(str(column))) + 2 * PDF_CELL_PADDING)
+        # Too wide for the page: narrow columns keep their width, the widest share what is left
+        wide, available = list(range(len(widths))), self.epw
+        while wide and sum(widths[i] for i in wide) > available:
+            share = available / len(wide)
+            narrow = [i for i in wide if widths[i] <= share]
+            if not narrow:
+                for i in wide:
+                    widths[i] = share
+                break
+            available -= sum(widths[i] for i in narrow)
+            wide = [i for i in wide if i not in narrow]
+        return widths
+
+    def table_header(self):
+        headers, widths = self.table_columns
+        line_height = PDF_FONT_SIZE * 0.5
+        self.set_font(self.font_name, 'B', PDF_FONT_SIZE)
+        for header, width in zip(headers, widths):
+            self.cell(width, line_height, header, border=1)
+        self.ln(line_height)
+        self.set_font(self.font_name, '', PDF_FONT_SIZE)
+
     def chapter_body(self, df):
-        try:
-            self.set_font('DejaVu', '', 10)
-            # Determine column widths dynamically (simple equal distribution)
-            col_width = self.w / (len(df.columns) * 1.1) # Adjust multiplier as needed
-            line_height = self.font_size * 1.5
-
-            # Define currency columns
-            currency_columns = ["Amount", "Total Amount", "Allocated", "Utilized", "Balance",
-                                "Income Tax", "Deposit", "Cess", "Total Deduction"] # Added deduction columns
-
-            # Table Header
-            self.set_font('DejaVu', 'B', 10)
-            col_names = df.columns.tolist() # Get column names
-            for col_name in col_names:
-                self.cell(col_width, line_height, str(col_name), border=1)
-            self.ln(line_height)
-            self.set_font('DejaVu', '', 10)
-
-            # Table Body
-            for index, row in df.iterrows():
-                for i, item in enumerate(row):
-                    col_name = col_names[i] # Get current column name
-                    # Handle potential None values and convert to string
-                    cell_text = str(item) if item is not None else ''
-                    # Prepend Rupee symbol if it's a currency column and not empty
-                    if col_name in currency_columns and cell_text:
-                        try:
-                            # Attempt to format as currency, handle potential errors
-                            # Check if it's already formatted (e.g., from dataframe config - unlikely here)
-                            if not cell_text.startswith('₹'):
-                                # Basic check if it looks like a number before formatting
-                                float(cell_text) # Raises ValueError if not convertible
-                                cell_text = f"₹{float(cell_text):,.2f}"
-                        except ValueError:
-                            pass # Keep original text if it's not a number
-                        except Exception as e:
-                            st.warning(f"Could not format currency value '{item}' in column '{col_name}': {e}") # Log other errors
-                            pass # Keep original text on other errors
-                    self.cell(col_width, line_height, cell_text, border=1)
-                self.ln(line_height)
-        except RuntimeError:
-            st.error("DejaVu font not found. PDF generation failed.")
-            return # Stop processing if font is missing
+        cells = format_report_columns(df, "₹" if self.font_name == "DejaVu" else "Rs. ")
+        widths = self.column_widths(cells)
+
+        # Clip values that no longer fit after scaling (measured on the widest value per column)
+        for column, width in zip(cells.columns, widths):
+            lengths = cells[column].str.len()
+            if len(cells) and lengths.max():
+                self.set_font(self.font_name, '', PDF_FONT_SIZE)
+                widest = cells[column][lengths.idxmax()]
+                max_chars = int(lengths.max() * (width - 2 * PDF_CELL_PADDING) / max(self.get_string_width(widest), 0.01))
+                if max_chars < lengths.max():
+                    cells[column] = cells[column].where(lengths <= max_chars, cells[column].str.slice(0, max(max_chars - 1, 0)) + "…")
+
+        self.table_columns = ([str(column) for column in cells.columns], widths)
+        self.table_header()
+
+        # Rows are drawn as plain text plus rules, which is much cheaper than one bordered cell per value
+        line_height = PDF_FONT_SIZE * 0.5
+        baseline = line_height * 0.7
+        left = self.l_margin
+        offsets = [left + sum(widths[:i]) + PDF_CELL_PADDING for i in range(len(widths))]
+        table_width = sum(widths)
+        page_top = self.y
+        for row in zip(*(cells[column].tolist() for column in cells.columns)):
+            if self.will_page_break(line_height):
+                self._column_rules(page_top, widths)
+                self.add_page()
+                self.table_header()
+                page_top = self.y
+            y = self.y
+            for text, x in zip(row, offsets):
+                if text:
+                    self.text(x, y + baseline, text)
+            self.line(left, y + line_height, left + table_width, y + line_height)
+            self.set_y(y + line_height)
+        self._column_rules(page_top, widths)
+
+    def _column_rules(self, top, widths):
+        x = self.l_margin
+        for width in [0] + widths:
+            x += width
+            self.line(x, top, x, self.y)
 
 def create_pdf_report(data, title):
-    pdf = PDF(orientation='L', unit='mm', format='A4') # Landscape for wider tables
-    pdf.report_title = title # Pass title to the PDF class instance
+    pdf = PDF(report_title=title, orientation='L', unit='mm', format='A4') # Landscape for wider tables
     pdf.add_page()
     pdf.chapter_body(data)
     # Ensure the output is explicitly bytes for Streamlit
-    return bytes(pdf.output(dest='S'))
+    return bytes(pdf.output())
 
 # --- End PDF Generation Helper ---
 
 
+# --- Report results ---
+REPORT_CACHE_MAX_BYTES = 256 * 1024 * 1024 # Memory cap for cached report frames (all sessions)
+REPORT_CACHE_MAX_ENTRIES = 64
+
+class ReportCache:
+    """Least-recently-used store of report frames, bounded by entry count and memory.
+
+    Keys carry the source table version, so a write to bills or works_plan makes older
+    results unreachable; they are dropped when a newer result for the same report is stored,
+    or when evicted. Cached frames are shared between sessions and must not be modified.
+    """
+
+    def __init__(self, max_bytes=REPORT_CACHE_MAX_BYTES, max_entries=REPORT_CACHE_MAX_ENTRIES):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.entries = OrderedDict() # key -> (data, error, size in bytes)
+        self.total_bytes = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            self.entries.move_to_end(key)
+            return entry[:2]
+
+    def put(self, key, data, error):
+        size = int(data.memory_usage(index=True, deep=True).sum())
+        with self.lock:
+            if size > self.max_bytes:
+                return # Larger than the whole cache; serve it uncached
+            # Results for the same report and range at an older data version are stale
+            for stale_key in [k for k in self.entries if k[:-1] == key[:-1] and k != key]:
+                self._drop(stale_key)
+            if key in self.entries:
+                self._drop(key)
+            self.entries[key] = (data, error, size)
+            self.total_bytes += size
+            while len(self.entries) > self.max_entries or self.total_bytes > self.max_bytes:
+                self._drop(next(iter(self.entries)))
+
+    def _drop(self, key):
+        self.total_bytes -= self.entries.pop(key)[2]
+
+@st.cache_resource
+def _report_cache():
+    return ReportCache()
+
+def get_report(report_type, start_date, end_date):
+    """build_report through the shared result cache (read-only result)."""
+    key = (report_type, start_date, end_date, report_data_version(report_type))
+    cache = _report_cache()
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+    data, error = build_report(report_type, start_date, end_date)
+    cache.put(key, data, error)
+    return data, error
+
+def build_report(report_type, start_date, end_date):
+    """Fetches and shapes one report; returns (data, error message or None)."""
+    # Fetch only the table (and columns) the selected report reads
+    bills_df = pd.DataFrame()
+    if report_type in REPORT_BILL_COLUMNS:
+        # Slice the date range out of the shared columnar snapshot (binary search on created_at)
+        columns = REPORT_BILL_COLUMNS[report_type]
+        bills_df = get_bills_snapshot(start_date, end_date).reindex(columns=columns)
+        # Closed fiscal years moved to the Parquet archive, read only if the range reaches them
+        archived = read_archived_bills(columns, start_date, end_date)
+        if archived is not None and not archived.empty:
+            archived = archived.reindex(columns=columns)
+            # An empty snapshot has untyped columns; concatenating it would make created_at object
+            bills_df = pd.concat([archived, bills_df], ignore_index=True) if not bills_df.empty else archived
+    works = get_works() if report_type == "Scheme Wise Expenditure" else []
+
+    data = pd.DataFrame() # Initialize data as an empty DataFrame
+    error = None
+
+    # Reports show and group by calendar date
+    if not bills_df.empty and 'created_at' in bills_df.columns:
+        bills_df['created_at'] = bills_df['created_at'].dt.date
+
+    # Process based on report type using the filtered bills_df
+    if not bills_df.empty:
+        if report_type == "Payment Register":
+            data = bills_df[["bill_no", "created_at", "payee", "work", "payable", "status"]]
+            data.columns = ["Bill No", "Date", "Payee", "Work", "Amount", "Status"]
+        elif report_type == "Deduction Register":
+             temp_data = bills_df[["bill_no", "created_at", "payee", "income_tax_amount",
+                            "deposit_amount", "cess_amount"]].copy()
+             temp_data["total_deduction"] = (temp_data.get("income_tax_amount", 0).fillna(0) +
+                                            temp_data.get("deposit_amount", 0).fillna(0) +
+                                            temp_data.get("cess_amount", 0).fillna(0))
+             data = temp_data[["bill_no", "created_at", "payee", "income_tax_amount",
+                            "deposit_amount", "cess_amount", "total_deduction"]]
+             data.columns = ["Bill No", "Date", "Payee", "Income Tax",
+                           "Deposit", "Cess", "Total Deduction"]
+
+    # Contractor Wise Payments is grouped in the database (one row per payee)
+    if report_type == "Contractor Wise Payments":
+        payee_totals = pd.DataFrame(get_bill_totals("payee", start_date, end_date))
+        if not payee_totals.empty:
+            data = payee_totals[["group_key", "bill_count", "payable", "last_created_at"]].copy()
+            data["last_created_at"] = pd.to_datetime(data["last_created_at"], format="ISO8601").dt.date
+            data.columns = ["Contractor", "Total Bills", "Total Amount", "Last Payment Date"]
+
+    # Scheme Wise Expenditure uses 'works' data, handle separately
+    if report_type == "Scheme Wise Expenditure":
+        if works:
+            works_df = pd.DataFrame(works)
+            # Ensure required columns exist before grouping
+            if all(col in works_df.columns for col in ["scheme", "allotment_amount", "expenditure"]):
+                data = works_df.groupby("scheme").agg(
+                    allocated=pd.NamedAgg(column="allotment_amount", aggfunc="sum"),
+                    utilized=pd.NamedAgg(column="expenditure", aggfunc="sum")
+                ).reset_index()
+                data["balance"] = data["allocated"] - data["utilized"]
+                # Avoid division by zero
+                data["utilization_percent"] = (data["utilized"] / data["allocated"].replace(0, pd.NA) * 100).fillna(0)
+                data.columns = ["Scheme", "Allocated", "Utilized", "Balance", "Utilization %"]
+            else:
+                error = "Works data is missing required columns (scheme, allotment_amount, expenditure)."
+                data = pd.DataFrame() # Ensure data is empty df on error
+        else:
+            data = pd.DataFrame() # No works data
+
+    return data, error
+# --- End Report results ---
+
+
+# --- Export files ---
+def report_data_version(report_type):
+    """Version of the table a report is computed from; changes whenever that table is written.
+    For the registers it is read after syncing the snapshot they slice, since a sync can bump
+    it; the rollup-based summaries do not touch the snapshot."""
+    if report_type == "Scheme Wise Expenditure":
+        return table_version("works_plan")
+    if report_type in REPORT_BILL_COLUMNS:
+        return bills_snapshot_version()
+    return table_version("bills")
+
+@st.cache_resource(ttl=CACHE_TTL, max_entries=16)
+def export_file(export_format, report_type, start_date, end_date, version, _data):
+    """Excel or PDF bytes for a report, built on first download and reused until the data changes.
+
+    Keyed by format, report type, date range and data version; _data (the report frame shown
+    on screen) is not hashed, since the key already identifies it.
+    """
+    if export_format == "xlsx":
+        if report_type in REGISTER_LAYOUTS:
+            # Registers stream from the database into a temporary file (constant memory)
+            with tempfile.TemporaryFile() as excel_file:
+                write_register_xlsx(report_type, start_date, end_date, excel_file)
+                excel_file.seek(0)
+                return excel_file.read()
+        output = io.BytesIO()
+        with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
+            _data.to_excel(writer, index=False, sheet_name='Report')
+        return output.getvalue()
+    pdf_title = f"{report_type} Report ({start_date.strftime('%d/%m/%Y')} - {end_date.strftime('%d/%m/%Y')})"
+    return create_pdf_report(_data, pdf_title)
+# --- End Export files ---
+
+
 def show_reports():
     st.header("Reports")
 
@@ -264,67 +499,9 @@ def show_reports():
     # Process and display results *outside* the form, only if submitted
     if submitted:
         start_date, end_date = date_range
-        all_bills = get_bills()
-        works = get_works()
-
-        bills_df = pd.DataFrame(all_bills)
-        data = pd.DataFrame() # Initialize data as an empty DataFrame
-
-        # Ensure 'created_at' is datetime for comparison and filter
-        if not bills_df.empty and 'created_at' in bills_df.columns:
-            try:
-                bills_df['created_at'] = pd.to_datetime(bills_df['created_at']).dt.date
-                # Filter by date range
-                bills_df = bills_df[
-                    (bills_df['created_at'] >= start_date) &
-                    (bills_df['created_at'] <= end_date)
-                ]
-            except Exception as e:
-                st.error(f"Error converting/filtering 'created_at' column: {e}")
-                bills_df = pd.DataFrame() # Reset df on error
-
-        # Process based on report type using the filtered bills_df
-        if not bills_df.empty:
-            if report_type == "Payment Register":
-                data = bills_df[["bill_no", "created_at", "payee", "work", "payable", "status"]]
-                data.columns = ["Bill No", "Date", "Payee", "Work", "Amount", "Status"]
-            elif report_type == "Contractor Wise Payments":
-                data = bills_df.groupby("payee").agg(
-                    total_bills=pd.NamedAgg(column="payable", aggfunc="count"),
-                    total_amount=pd.NamedAgg(column="payable", aggfunc="sum"),
-                    last_payment_date=pd.NamedAgg(column="created_at", aggfunc="max")
-                ).reset_index()
-                data.columns = ["Contractor", "Total Bills", "Total Amount", "Last Payment Date"]
-            elif report_type == "Deduction Register":
-                 temp_data = bills_df[["bill_no", "created_at", "payee", "income_tax_amount",
-                                "deposit_amount", "cess_amount"]].copy()
-                 temp_data["total_deduction"] = (temp_data.get("income_tax_amount", 0).fillna(0) +
-                                                temp_data.get("deposit_amount", 0).fillna(0) +
-                                                temp_data.get("cess_amount", 0).fillna(0))
-                 data = temp_data[["bill_no", "created_at", "payee", "income_tax_amount",
-                                "deposit_amount", "cess_amount", "total_deduction"]]
-                 data.columns = ["Bill No", "Date", "Payee", "Income Tax",
-                               "Deposit", "Cess", "Total Deduction"]
-
-        # Scheme Wise Expenditure uses 'works' data, handle separately
-        if report_type == "Scheme Wise Expenditure":
-            if works:
-                works_df = pd.DataFrame(works)
-                # Ensure required columns exist before grouping
-                if all(col in works_df.columns for col in ["scheme", "allotment_amount", "expenditure"]):
-                    data = works_df.groupby("scheme").agg(
-                        allocated=pd.NamedAgg(column="allotment_amount", aggfunc="sum"),
-                        utilized=pd.NamedAgg(column="expenditure", aggfunc="sum")
-                    ).reset_index()
-                    data["balance"] = data["allocated"] - data["utilized"]
-                    # Avoid division by zero
-                    data["utilization_percent"] = (data["utilized"] / data["allocated"].replace(0, pd.NA) * 100).fillna(0)
-                    data.columns = ["Scheme", "Allocated", "Utilized", "Balance", "Utilization %"]
-                else:
-                    st.error("Works data is missing required columns (scheme, allotment_amount, expenditure).")
-                    data = pd.DataFrame() # Ensure data is empty df on error
-            else:
-                data = pd.DataFrame() # No works data
+        data, error = get_report(report_type, start_date, end_date)
+        if error:
+            st.error(error)
 
         # Display results and export options
         if not data.empty:
@@ -344,13 +521,9 @@ def show_reports():
                 }
             )
 
-            # Format date columns for PDF export if they exist
-            if 'Date' in data.columns:
-                data['Date'] = pd.to_datetime(data['Date']).dt.strftime('%d/%m/%Y')
-            if 'Last Payment Date' in data.columns:
-                data['Last Payment Date'] = pd.to_datetime(data['Last Payment Date']).dt.strftime('%d/%m/%Y')
-
-            # Export options
+            # Export options: files are built only when a download is clicked (see export_file)
+            file_stem = f"{report_type.lower().replace(' ', '_')}_report"
+            version = report_data_version(report_type)
             export_col2, export_col3 = st.columns(2)
             # with export_col1:
             #    st.download_button(
@@ -360,31 +533,25 @@ def show_reports():
             #        mime="text/csv" # Use keyword arg
             #    )
             with export_col2:
-                output = io.BytesIO()
-                with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-                     data.to_excel(writer, index=False, sheet_name='Report')
-                excel_data = output.getvalue()
                 st.download_button(
                     label="Download Excel",
-                    data=excel_data,
-                    file_name=f"{report_type.lower().replace(' ', '_')}_report.xlsx", # Use keyword arg
-                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet" # Use keyword arg
+                    data=lambda: export_file("xlsx", report_type, start_date, end_date, version, data),
+                    file_name=f"{file_stem}.xlsx", # Use keyword arg
+                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", # Use keyword arg
+                    on_click="ignore" # Keep the report on screen
                 )
             with export_col3:
-                # Generate PDF data
-                pdf_title = f"{report_type} Report ({start_date.strftime('%d/%m/%Y')} - {end_date.strftime('%d/%m/%Y')})"
-                pdf_data = create_pdf_report(data, pdf_title)
                 st.download_button(
                     label="Download PDF",
-                    data=pdf_data,
-                    file_name=f"{report_type.lower().replace(' ', '_')}_report.pdf",
-                    mime="application/pdf"
+                    data=lambda: export_file("pdf", report_type, start_date, end_date, version, data),
+                    file_name=f"{file_stem}.pdf",
+                    mime="application/pdf",
+                    on_click="ignore"
                 )
         else:
             # Display warning only if no data was generated for the selected report type
-            # Avoid showing warning if bills_df was empty but works_df might have data (for Scheme Wise)
-            # Check if 'data' is empty AND (it wasn't Scheme Wise OR works data was also empty)
-            if data.empty and (report_type != "Scheme Wise Expenditure" or not works):
+            # (a missing-columns error for Scheme Wise has already been shown)
+            if not error:
                  st.warning("No data found for the selected criteria")
 
 # Remove the direct call to show_reports()
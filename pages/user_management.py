@@ -1,12 +1,14 @@
 import streamlit as st
 # Import necessary functions, including the new ones
-from utils.db import add_user, get_users, update_user_permissions, get_user_by_username
+from utils.db import add_user, get_users_with_permissions, update_user_permissions
 import hashlib # For password hashing
 import pandas as pd # For better table display
+import math
 
 # Define all available pages (excluding User Management itself for selection)
 # Ensure these names match exactly what's used in app.py navigation/routing
 ALL_AVAILABLE_PAGES = ["Dashboard", "Create Bill", "Contractors", "Works", "Reports", "Settings"]
+USERS_PER_PAGE = 25
 
 def show_user_management():
     """Displays the user management page content."""
@@ -44,22 +46,23 @@ def show_user_management():
     # --- Existing Users Section ---
     st.subheader("Manage Existing Users & Permissions")
     try:
-        # Fetch all user data needed (username, role, allowed_pages)
-        # Note: get_users() currently only returns username, role. We need full data.
-        # Let's modify this to fetch all data or use get_user_by_username iteratively (less efficient)
-        # Option 1: Modify get_users() - Preferred (Requires changing get_users in db.py)
-        # Option 2: Fetch details per user (shown below for now, less ideal for many users)
-
-        all_users_basic = get_users() # Gets username, role
-
-        if all_users_basic:
-            user_details_list = []
-            for basic_user in all_users_basic:
-                # Fetch full details for each user to get allowed_pages
-                full_user_data = get_user_by_username(basic_user['username'])
-                if full_user_data:
-                    user_details_list.append(full_user_data[0]) # get_user_by_username returns a list
+        # One query returns username, role and allowed_pages (no password hashes) for the current page
+        page_number = st.session_state.get("users_page", 1)
+        user_details_list, total_users = get_users_with_permissions(
+            limit=USERS_PER_PAGE, offset=(page_number - 1) * USERS_PER_PAGE
+        )
+        total_pages = max(1, math.ceil((total_users or 0) / USERS_PER_PAGE))
+        if page_number > total_pages:
+            # Users were removed since this page was chosen: show the last page instead
+            page_number = st.session_state.users_page = total_pages
+            user_details_list, total_users = get_users_with_permissions(
+                limit=USERS_PER_PAGE, offset=(page_number - 1) * USERS_PER_PAGE
+            )
+        st.number_input(
+            f"Page (of {total_pages})", min_value=1, max_value=total_pages, step=1, key="users_page"
+        )
 
+        if total_users:
             if user_details_list:
                 # Use columns for layout
                 col1, col2, col3 = st.columns([1, 2, 1]) # Adjust ratios as needed
@@ -0,0 +1,105 @@
+-- Daily bill totals by payee, scheme, major head and bill type.
+-- insert_bill (utils/db.py) folds each new bill in through apply_bills_to_rollup;
+-- rebuild_bills_rollup() recomputes the table from bills for backfills
+-- (python -m utils.maintenance rebuild-rollup).
+-- Missing keys are stored as '' so they can take part in the primary key.
+
+create table if not exists bills_daily_rollup (
+    day date not null,
+    payee text not null default '',
+    scheme text not null default '',
+    major_head text not null default '',
+    bill_type text not null default '',
+    bill_count bigint not null default 0,
+    billed_amount numeric not null default 0,
+    payable numeric not null default 0,
+    net_amount numeric not null default 0,
+    income_tax_amount numeric not null default 0,
+    deposit_amount numeric not null default 0,
+    cess_amount numeric not null default 0,
+    cgst_amount numeric not null default 0,
+    sgst_amount numeric not null default 0,
+    total_deduction numeric not null default 0,
+    last_created_at timestamp,
+    primary key (day, payee, scheme, major_head, bill_type)
+);
+
+-- bills: JSON array of bill rows as returned by the insert
+create or replace function apply_bills_to_rollup(bills jsonb)
+returns void
+language sql
+as $$
+    insert into bills_daily_rollup as r (
+        day, payee, scheme, major_head, bill_type, bill_count,
+        billed_amount, payable, net_amount, income_tax_amount, deposit_amount,
+        cess_amount, cgst_amount, sgst_amount, total_deduction, last_created_at
+    )
+    select
+        (b->>'created_at')::timestamp::date,
+        coalesce(b->>'payee', ''),
+        coalesce(b->>'scheme', ''),
+        coalesce(b->>'major_head', ''),
+        coalesce(b->>'bill_type', ''),
+        count(b->>'payable'),
+        coalesce(sum((b->>'billed_amount')::numeric), 0),
+        coalesce(sum((b->>'payable')::numeric), 0),
+        coalesce(sum((b->>'net_amount')::numeric), 0),
+        coalesce(sum((b->>'income_tax_amount')::numeric), 0),
+        coalesce(sum((b->>'deposit_amount')::numeric), 0),
+        coalesce(sum((b->>'cess_amount')::numeric), 0),
+        coalesce(sum((b->>'cgst_amount')::numeric), 0),
+        coalesce(sum((b->>'sgst_amount')::numeric), 0),
+        coalesce(sum((b->>'total_deduction')::numeric), 0),
+        max((b->>'created_at')::timestamp)
+    from jsonb_array_elements(bills) b
+    where b->>'created_at' is not null
+    group by 1, 2, 3, 4, 5
+    on conflict (day, payee, scheme, major_head, bill_type) do update set
+        bill_count = r.bill_count + excluded.bill_count,
+        billed_amount = r.billed_amount + excluded.billed_amount,
+        payable = r.payable + excluded.payable,
+        net_amount = r.net_amount + excluded.net_amount,
+        income_tax_amount = r.income_tax_amount + excluded.income_tax_amount,
+        deposit_amount = r.deposit_amount + excluded.deposit_amount,
+        cess_amount = r.cess_amount + excluded.cess_amount,
+        cgst_amount = r.cgst_amount + excluded.cgst_amount,
+        sgst_amount = r.sgst_amount + excluded.sgst_amount,
+        total_deduction = r.total_deduction + excluded.total_deduction,
+        last_created_at = greatest(r.last_created_at, excluded.last_created_at);
+$$;
+
+-- Recomputes the whole rollup from bills; returns the number of rollup rows
+create or replace function rebuild_bills_rollup()
+returns bigint
+language sql
+as $$
+    delete from bills_daily_rollup;
+
+    insert into bills_daily_rollup (
+        day, payee, scheme, major_head, bill_type, bill_count,
+        billed_amount, payable, net_amount, income_tax_amount, deposit_amount,
+        cess_amount, cgst_amount, sgst_amount, total_deduction, last_created_at
+    )
+    select
+        b.created_at::date,
+        coalesce(b.payee, ''),
+        coalesce(b.scheme, ''),
+        coalesce(b.major_head, ''),
+        coalesce(b.bill_type, ''),
+        count(b.payable),
+        coalesce(sum(b.billed_amount), 0),
+        coalesce(sum(b.payable), 0),
+        coalesce(sum(b.net_amount), 0),
+        coalesce(sum(b.income_tax_amount), 0),
+        coalesce(sum(b.deposit_amount), 0),
+        coalesce(sum(b.cess_amount), 0),
+        coalesce(sum(b.cgst_amount), 0),
+        coalesce(sum(b.sgst_amount), 0),
+        coalesce(sum(b.total_deduction), 0),
+        max(b.created_at)::timestamp
+    from bills b
+    where b.created_at is not null
+    group by 1, 2, 3, 4, 5;
+
+    select count(*) from bills_daily_rollup;
+$$;
@@ -0,0 +1,56 @@
+-- Pre-grouped bill totals for reports, called through PostgREST as rpc("bill_totals").
+-- group_by is one of 'payee', 'scheme', 'major_head', 'bill_type' or 'day'.
+-- start_date and end_date are inclusive; NULL leaves that side of the range open.
+-- Reads the daily rollup (01_bills_daily_rollup.sql), so the cost grows with the
+-- number of days in the range rather than the number of bills.
+-- The local SQLite backend (utils/local_db.py) implements the same function.
+
+create or replace function bill_totals(group_by text, start_date date default null, end_date date default null)
+returns table (
+    group_key text,
+    bill_count bigint,
+    billed_amount numeric,
+    payable numeric,
+    net_amount numeric,
+    income_tax_amount numeric,
+    deposit_amount numeric,
+    cess_amount numeric,
+    cgst_amount numeric,
+    sgst_amount numeric,
+    total_deduction numeric,
+    last_created_at timestamp
+)
+language sql stable
+as $$
+    select grouped.*
+    from (
+        select
+            case group_by
+                when 'payee' then nullif(r.payee, '')
+                when 'scheme' then nullif(r.scheme, '')
+                when 'major_head' then nullif(r.major_head, '')
+                when 'bill_type' then nullif(r.bill_type, '')
+                when 'day' then to_char(r.day, 'YYYY-MM-DD')
+            end as group_key,
+            sum(r.bill_count)::bigint as bill_count,
+            sum(r.billed_amount) as billed_amount,
+            sum(r.payable) as payable,
+            sum(r.net_amount) as net_amount,
+            sum(r.income_tax_amount) as income_tax_amount,
+            sum(r.deposit_amount) as deposit_amount,
+            sum(r.cess_amount) as cess_amount,
+            sum(r.cgst_amount) as cgst_amount,
+            sum(r.sgst_amount) as sgst_amount,
+            sum(r.total_deduction) as total_deduction,
+            max(r.last_created_at) as last_created_at
+        from bills_daily_rollup r
+        where (start_date is null or r.day >= start_date)
+          and (end_date is null or r.day <= end_date)
+        group by 1
+    ) grouped
+    where grouped.group_key is not null
+    order by grouped.group_key;
+$$;
+
+-- Serves the created_at range filter used by the report queries
+create index if not exists bills_created_at_id_idx on bills (created_at, id);
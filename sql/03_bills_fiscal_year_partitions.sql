@@ -0,0 +1,109 @@
+-- Range-partitions bills by fiscal year (1 April - 31 March) on created_at.
+-- Every bill read filters on created_at (get_bills, iter_bills, the snapshot delta), so
+-- PostgreSQL prunes to the partitions overlapping the requested dates and a current-year
+-- report no longer scans closed years. The daily rollup is unchanged and stays unpartitioned.
+-- Run once after 01 and 02: it moves the existing rows into the partitioned table in one
+-- transaction and keeps the old table as bills_unpartitioned until you drop it.
+-- The new table gets the old table's row level security settings and copies of its
+-- policies, and the grants are re-applied.
+
+begin;
+
+-- Creates the partition for fiscal year fy-(fy+1) if it is missing. Call it before each
+-- April (for example from pg_cron); bills dated in a year without a partition land in
+-- bills_fy_default and are moved into the new partition when it is created.
+create or replace function ensure_bills_fiscal_year(fy integer)
+returns text
+language plpgsql
+as $$
+declare
+    partition_name text := format('bills_fy%s_%s', fy, lpad(((fy + 1) % 100)::text, 2, '0'));
+    year_start date := make_date(fy, 4, 1);
+    year_end date := make_date(fy + 1, 4, 1);
+    has_default boolean := to_regclass('bills_fy_default') is not null;
+begin
+    if to_regclass(partition_name) is not null then
+        return partition_name;
+    end if;
+    if has_default then
+        alter table bills detach partition bills_fy_default;
+    end if;
+    execute format(
+        'create table %I partition of bills for values from (%L) to (%L)',
+        partition_name, year_start, year_end
+    );
+    if has_default then
+        insert into bills
+        select * from bills_fy_default where created_at >= year_start and created_at < year_end;
+        delete from bills_fy_default where created_at >= year_start and created_at < year_end;
+        alter table bills attach partition bills_fy_default default;
+    end if;
+    return partition_name;
+end;
+$$;
+
+alter table bills rename to bills_unpartitioned;
+alter index if exists bills_created_at_id_idx rename to bills_unpartitioned_created_at_id_idx;
+
+-- Identity columns cannot move to a partitioned parent on every PostgreSQL version,
+-- so id is served from a plain sequence that continues after the existing ids. It needs
+-- its own name: bills_id_seq may be the identity sequence of bills_unpartitioned.id.
+create sequence bills_partitioned_id_seq;
+select setval('bills_partitioned_id_seq', coalesce((select max(id) from bills_unpartitioned), 0) + 1, false);
+
+create table bills (like bills_unpartitioned including defaults) partition by range (created_at);
+alter table bills alter column id set default nextval('bills_partitioned_id_seq');
+alter table bills alter column created_at set default now();
+alter table bills add primary key (id, created_at);
+alter sequence bills_partitioned_id_seq owned by bills.id;
+
+-- One partition per year that has bills, through next year. Shifting a date back three
+-- months puts April in January, so its calendar year is the fiscal year (2024 for 2024-25).
+select ensure_bills_fiscal_year(fy)
+from generate_series(
+    coalesce(
+        (select extract(year from min(created_at) - interval '3 months')::integer from bills_unpartitioned),
+        extract(year from now() - interval '3 months')::integer
+    ),
+    extract(year from now() - interval '3 months')::integer + 1
+) as fy;
+create table if not exists bills_fy_default partition of bills default;
+
+insert into bills select * from bills_unpartitioned;
+
+create index if not exists bills_created_at_id_idx on bills (created_at, id);
+
+-- The rename kept the RLS settings and policies on bills_unpartitioned; copy them over.
+-- RLS is enabled only if it was before: with no policies it would block the anon key.
+do $$
+declare
+    policy record;
+    old_table record;
+begin
+    select relrowsecurity, relforcerowsecurity into old_table
+    from pg_class where oid = 'bills_unpartitioned'::regclass;
+    if old_table.relrowsecurity then
+        alter table bills enable row level security;
+    end if;
+    if old_table.relforcerowsecurity then
+        alter table bills force row level security;
+    end if;
+
+    for policy in
+        select * from pg_policies where schemaname = current_schema() and tablename = 'bills_unpartitioned'
+    loop
+        execute format(
+            'create policy %I on bills as %s for %s to %s%s%s',
+            policy.policyname, policy.permissive, policy.cmd,
+            (select string_agg(quote_ident(role_name), ', ') from unnest(policy.roles) as role_name),
+            coalesce(' using (' || policy.qual || ')', ''),
+            coalesce(' with check (' || policy.with_check || ')', '')
+        );
+    end loop;
+end;
+$$;
+
+grant select, insert, update, delete on bills to anon, authenticated, service_role;
+grant usage, select on sequence bills_partitioned_id_seq to anon, authenticated, service_role;
+
+commit;
@@ -0,0 +1,131 @@
+"""Cold storage for closed fiscal years: bills moved out of the database into Parquet files.
+
+One zstd-compressed file per fiscal year under BILLS_ARCHIVE_DIR (default ``archive``),
+sorted by (created_at, id) and written in row groups, so a date-filtered read only decodes
+the row groups whose created_at statistics overlap the range. Report reads open the files
+only when the selected range reaches an archived year. Move a year with::
+
+    python -m utils.maintenance archive-bills --year 2023
+"""
+import datetime
+import os
+import re
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import streamlit as st
+from .db import iter_bills, bills_frame, delete_bills
+from .helpers import fiscal_year, fiscal_year_bounds, fiscal_year_label, fiscal_years_between
+
+ARCHIVE_DIR = os.getenv("BILLS_ARCHIVE_DIR", "archive")
+ARCHIVE_ROW_GROUP_SIZE = 10000
+ARCHIVE_BATCH_SIZE = 10000
+_ARCHIVE_FILE = re.compile(r"^bills_fy(\d{4})_\d{2}\.parquet$")
+
+def archive_path(year):
+    return os.path.join(ARCHIVE_DIR, f"bills_fy{year}_{(year + 1) % 100:02d}.parquet")
+
+def archived_years():
+    """Fiscal years with an archive file, oldest first."""
+    if not os.path.isdir(ARCHIVE_DIR):
+        return []
+    return sorted(int(match.group(1)) for match in map(_ARCHIVE_FILE.match, os.listdir(ARCHIVE_DIR)) if match)
+
+def _created_at_filter(start_date, end_date):
+    """created_at predicate for [start_date, end_date] (whole days), pushed down to the row groups."""
+    expression = None
+    if start_date:
+        expression = ds.field("created_at") >= datetime.datetime.combine(start_date, datetime.time())
+    if end_date:
+        before_end = ds.field("created_at") < datetime.datetime.combine(end_date + datetime.timedelta(days=1), datetime.time())
+        expression = before_end if expression is None else expression & before_end
+    return expression
+
+def _archive_scanner(columns, start_date, end_date, batch_size=None):
+    """Scanner over the archive files overlapping the range, or None when there are none."""
+    paths = [archive_path(year) for year in fiscal_years_between(start_date, end_date, archived_years())]
+    if not paths:
+        return None
+    # Columns that held only NULLs in one year are typed null there; unify with the other years
+    schema = pa.unify_schemas([pq.read_schema(path) for path in paths])
+    dataset = ds.dataset(paths, schema=schema, format="parquet")
+    if columns and columns != "*":
+        columns = [column for column in columns if column in schema.names]
+    else:
+        columns = None
+    options = {"batch_size": batch_size} if batch_size else {}
+    return dataset.scanner(columns=columns, filter=_created_at_filter(start_date, end_date), **options)
+
+def read_archived_bills(columns=None, start_date=None, end_date=None):
+    """Archived bills in the date range as a typed frame (see bills_frame), oldest first;
+    None when the range does not reach an archived year."""
+    scanner = _archive_scanner(columns, start_date, end_date)
+    if scanner is None:
+        return None
+    return bills_frame(scanner.to_table().to_pandas())
+
+def archive_version(start_date=None, end_date=None):
+    """(year, file mtime) of each archive file the range reaches: a cache key for reads of them."""
+    years = fiscal_years_between(start_date, end_date, archived_years())
+    return tuple((year, os.stat(archive_path(year)).st_mtime_ns) for year in years)
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _cached_archived_bills(columns, start_date, end_date, version):
+    return read_archived_bills(list(columns) if columns else None, start_date, end_date)
+
+def get_archived_bills(columns=None, start_date=None, end_date=None):
+    """read_archived_bills, cached per range until an archive file it read is rewritten."""
+    version = archive_version(start_date, end_date)
+    if not version:
+        return None
+    return _cached_archived_bills(tuple(columns) if columns else None, start_date, end_date, version)
+
+def iter_archived_bills(columns=None, start_date=None, end_date=None, batch_size=1000):
+    """Yields archived bills in the date range as lists of row dicts, like iter_bills."""
+    scanner = _archive_scanner(columns, start_date, end_date, batch_size)
+    if scanner is None:
+        return
+    for batch in scanner.to_batches():
+        if batch.num_rows:
+            yield batch.to_pylist()
+
+class UnsettledBillsError(ValueError):
+    """A fiscal year still has Pending bills, which cannot be updated once archived."""
+
+def archive_fiscal_year(year, force=False):
+    """Moves the bills of a closed fiscal year into its archive file; returns the number moved.
+
+    Raises UnsettledBillsError if the year still has Pending bills, unless force=True.
+
+    The file is written in full before it replaces the previous one, and bills are deleted
+    from the database only after that, so an interrupted run loses nothing; re-running it
+    merges with the existing file. bills_daily_rollup keeps the year, so the summary reports
+    are unchanged. The year is held in memory while the file is written.
+    """
+    if year >= fiscal_year(datetime.date.today()):
+        raise ValueError(f"Fiscal year {fiscal_year_label(year)} is not closed yet.")
+    start_date, end_date = fiscal_year_bounds(year)
+    frames = [bills_frame(batch) for batch in iter_bills(None, start_date, end_date, batch_size=ARCHIVE_BATCH_SIZE)]
+    if not frames:
+        return 0
+    bills = pd.concat(frames, ignore_index=True)
+    pending = int((bills["status"] == "Pending").sum()) if "status" in bills.columns else 0
+    if pending and not force:
+        raise UnsettledBillsError(
+            f"Fiscal year {fiscal_year_label(year)} still has {pending} Pending bills; settle them or archive with --force."
+        )
+    moved_ids = bills["id"].tolist()
+
+    path = archive_path(year)
+    if os.path.exists(path):
+        bills = pd.concat([bills_frame(pq.read_table(path).to_pandas()), bills], ignore_index=True)
+        bills = bills.drop_duplicates("id", keep="last").sort_values(["created_at", "id"], ignore_index=True)
+
+    os.makedirs(ARCHIVE_DIR, exist_ok=True)
+    partial_path = f"{path}.partial"
+    pq.write_table(pa.Table.from_pandas(bills, preserve_index=False), partial_path,
+                   compression="zstd", row_group_size=ARCHIVE_ROW_GROUP_SIZE)
+    os.replace(partial_path, path)
+    delete_bills(moved_ids)
+    return len(moved_ids)
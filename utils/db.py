@@ -1,14 +1,27 @@
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 from supabase import create_client, Client
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import datetime
+import numpy as np
+import pandas as pd
 from dotenv import load_dotenv
+from .helpers import fiscal_years_between
 
 # Load environment variables
 load_dotenv()
 
-# Initialize Supabase client
+# Initialize the data backend client. DB_BACKEND=sqlite swaps Supabase for the local
+# SQLite stand-in (utils/local_db.py), which exposes the same query-builder API.
 @st.cache_resource
 def init_supabase():
+    if os.getenv("DB_BACKEND", "supabase").lower() == "sqlite":
+        from .local_db import LocalClient
+        return LocalClient(os.getenv("SQLITE_PATH", ":memory:"))
+
     url = os.getenv("SUPABASE_URL")
     key = os.getenv("SUPABASE_KEY")
     if not url or not key:
@@ -18,66 +31,504 @@ def init_supabase():
 
 # Removed: supabase = init_supabase() - Initialize inside functions instead
 
-def get_contractors():
+def _select_list(columns):
+    """Builds a PostgREST select list, quoting names that are not plain identifiers ("Allot No")."""
+    if not columns or columns == "*":
+        return "*"
+    if isinstance(columns, str):
+        return columns
+    return ", ".join(column if column.isidentifier() else f'"{column}"' for column in columns)
+
+# --- Versioned query cache ---
+# Cached reads are keyed by their table's version. Writes bump only their own table,
+# so unrelated reference data (budget_plan, budget_np) stays cached across sessions.
+# CACHE_TTL bounds staleness for rows written outside this process.
+CACHE_TTL = 3600
+_versions_lock = threading.Lock()
+
+@st.cache_resource
+def _table_versions():
+    return {} # table name -> version, shared by every session in the process
+
+def table_version(table):
+    """Returns the current cache version of a table."""
+    return _table_versions().get(table, 0)
+
+def bump_table_version(*tables):
+    """Invalidates every cached read of the given tables."""
+    versions = _table_versions()
+    with _versions_lock:
+        for table in tables:
+            versions[table] = versions.get(table, 0) + 1
+
+def _created_at_range(query, start_date=None, end_date=None):
+    """Applies inclusive start/end dates to a query as created_at bounds."""
+    if start_date:
+        query = query.gte("created_at", start_date.isoformat())
+    if end_date:
+        # end_date is inclusive, so bound by the start of the following day
+        query = query.lt("created_at", (end_date + datetime.timedelta(days=1)).isoformat())
+    return query
+
+# `version` is unused in the body but part of the cache key
+@st.cache_data(ttl=CACHE_TTL, max_entries=256, show_spinner=False)
+def _cached_select(table, version, select, start_date=None, end_date=None):
     supabase = init_supabase()
     if not supabase: return [] # Handle initialization failure
-    return supabase.table("contractors").select("*").execute().data
+    query = supabase.table(table).select(select)
+    return _created_at_range(query, start_date, end_date).execute().data
+
+# Readers take an optional `columns` list so pages fetch only the fields they render.
+
+def get_contractors(columns=None):
+    return _cached_select("contractors", table_version("contractors"), _select_list(columns))
+
+def get_works(columns=None):
+    return _cached_select("works_plan", table_version("works_plan"), _select_list(columns))
 
-def get_works():
+def get_bills(columns=None, start_date=None, end_date=None):
+    return _cached_select("bills", table_version("bills"), _select_list(columns), start_date, end_date)
+
+def get_budget_np(columns=None):
+    return _cached_select("budget_np", table_version("budget_np"), _select_list(columns))
+
+def get_budget_plan(columns=None):
+    return _cached_select("budget_plan", table_version("budget_plan"), _select_list(columns))
+
+@st.cache_data(ttl=CACHE_TTL, max_entries=64, show_spinner=False)
+def _cached_count(table, version, count_method, filters):
     supabase = init_supabase()
-    if not supabase: return []
-    return supabase.table("works_plan").select("*").execute().data
+    if not supabase: return None
+    query = supabase.table(table).select("*", count=count_method, head=True)
+    for column, value in filters:
+        query = query.eq(column, value)
+    return query.execute().count
 
-def get_bills():
+def count_rows(table, estimated=False, **filters):
+    """Counts rows matching equality filters without transferring them (None if unavailable).
+
+    estimated=True asks PostgREST for the planner estimate, which is cheaper on large tables.
+    """
+    count_method = "estimated" if estimated else "exact"
+    return _cached_count(table, table_version(table), count_method, tuple(sorted(filters.items())))
+
+def count_bills(status=None, estimated=False):
+    """Counts bills, optionally only those with the given status."""
+    filters = {"status": status} if status else {}
+    return count_rows("bills", estimated=estimated, **filters)
+
+@st.cache_data(ttl=CACHE_TTL, max_entries=128, show_spinner=False)
+def _cached_rpc(function, version, params):
     supabase = init_supabase()
     if not supabase: return []
-    return supabase.table("bills").select("*").execute().data
+    return supabase.rpc(function, dict(params)).execute().data
+
+def get_bill_totals(group_by, start_date=None, end_date=None):
+    """Bill totals grouped by 'payee', 'scheme', 'major_head', 'bill_type' or 'day', aggregated in the database.
+
+    Calls the bill_totals function (sql/02_bill_totals.sql), which reads the daily rollup,
+    so only one row per group is transferred. Each row has group_key, bill_count, the summed money and deduction
+    columns and last_created_at.
+    """
+    params = (
+        ("group_by", group_by),
+        ("start_date", start_date.isoformat() if start_date else None),
+        ("end_date", end_date.isoformat() if end_date else None),
+    )
+    return _cached_rpc("bill_totals", table_version("bills"), params)
 
-def get_budget_np():
+def rebuild_bills_rollup():
+    """Recomputes bills_daily_rollup from the bills table (backfill); returns the rollup row count."""
     supabase = init_supabase()
-    if not supabase: return []
-    return supabase.table("budget_np").select("*").execute().data
+    if not supabase: return None
+    row_count = supabase.rpc("rebuild_bills_rollup", {}).execute().data
+    bump_table_version("bills")
+    return row_count
+
+# Numeric bill columns, typed as float64 when bills are assembled into a DataFrame
+BILL_MONEY_COLUMNS = [
+    "billed_amount", "deduct_payments", "payable", "restricted_to_amount",
+    "income_tax_amount", "deposit_amount", "cess_amount", "cgst_amount", "sgst_amount",
+    "total_deduction", "net_amount",
+]
+# Low-cardinality text columns, stored as categoricals in the shared snapshot
+BILL_CATEGORY_COLUMNS = ["payee", "scheme", "major_head", "status", "bill_type"]
 
-def get_budget_plan():
+def iter_bills(columns=None, start_date=None, end_date=None, batch_size=1000, after=None):
+    """Yields bills as lists of at most batch_size rows, paging by the (created_at, id) keyset.
+
+    Each request continues after the last row of the previous batch, so memory stays
+    bounded and PostgREST's max-rows cap cannot silently truncate the result.
+    `after` is an optional (created_at, id) pair to resume from.
+    """
     supabase = init_supabase()
+    if not supabase: return
+
+    if columns and columns != "*":
+        # The keyset columns must be in every batch
+        columns = list(columns) + [c for c in ("created_at", "id") if c not in columns]
+    select = _select_list(columns)
+
+    while True:
+        query = _created_at_range(supabase.table("bills").select(select), start_date, end_date)
+        if after:
+            created_at, row_id = after
+            query = query.or_(f'created_at.gt."{created_at}",and(created_at.eq."{created_at}",id.gt.{row_id})')
+        batch = query.order("created_at").order("id").limit(batch_size).execute().data
+        if not batch:
+            return
+        yield batch
+        # Stop only on an empty page: a short page may just be the server's row cap
+        after = (batch[-1]["created_at"], batch[-1]["id"])
+
+def bills_frame(rows, categorical=False):
+    """Builds a typed DataFrame from bill rows: datetime created_at and float money columns.
+
+    With categorical=True the BILL_CATEGORY_COLUMNS are stored as pandas categoricals.
+    """
+    df = pd.DataFrame(rows)
+    if "created_at" in df.columns:
+        df["created_at"] = pd.to_datetime(df["created_at"], format="ISO8601")
+        if df["created_at"].dt.tz is not None:
+            df["created_at"] = df["created_at"].dt.tz_localize(None) # Compare with naive dates
+    for column in BILL_MONEY_COLUMNS:
+        if column in df.columns:
+            df[column] = pd.to_numeric(df[column], errors="coerce").astype("float64")
+    if categorical:
+        for column in BILL_CATEGORY_COLUMNS:
+            if column in df.columns:
+                df[column] = df[column].astype("category")
+    return df
+
+def _concat_bills(frames):
+    """Concatenates snapshot frames, merging categories so those columns stay categorical."""
+    frames = list(frames)
+    if len(frames) == 1:
+        return frames[0]
+    categories = {}
+    for column in BILL_CATEGORY_COLUMNS:
+        if all(column in frame.columns for frame in frames):
+            merged = frames[0][column].cat.categories
+            for frame in frames[1:]:
+                merged = merged.union(frame[column].cat.categories)
+            categories[column] = merged
+    return pd.concat([
+        frame.assign(**{column: frame[column].cat.set_categories(merged) for column, merged in categories.items()})
+        for frame in frames
+    ], ignore_index=True)
+
+def _split_by_fiscal_year(frame):
+    """{fiscal year: rows} for a created_at-ordered frame; each part keeps the order."""
+    created_at = frame["created_at"]
+    years = created_at.dt.year - (created_at.dt.month < 4)
+    return {int(year): part.reset_index(drop=True) for year, part in frame.groupby(years, sort=True)}
+
+def bills_between(frame, start_date=None, end_date=None):
+    """Rows of a created_at-ordered bills frame in [start_date, end_date] (whole days), by binary search."""
+    created_at = frame["created_at"].to_numpy()
+    start = created_at.searchsorted(np.datetime64(pd.Timestamp(start_date)), "left") if start_date else 0
+    end = (created_at.searchsorted(np.datetime64(pd.Timestamp(end_date + datetime.timedelta(days=1))), "left")
+           if end_date else len(created_at))
+    return frame.iloc[start:end]
+
+@st.cache_data(ttl=CACHE_TTL, max_entries=32, show_spinner=False)
+def _cached_bills_frame(version, columns, start_date, end_date, batch_size):
+    frames = [bills_frame(batch) for batch in iter_bills(columns, start_date, end_date, batch_size)]
+    if not frames:
+        return pd.DataFrame(columns=list(columns) if columns and columns != "*" else None)
+    return pd.concat(frames, ignore_index=True)
+
+def get_bills_frame(columns=None, start_date=None, end_date=None, batch_size=1000):
+    """Streams bills with iter_bills and assembles the batches into one typed DataFrame."""
+    columns = tuple(columns) if columns and columns != "*" else None
+    return _cached_bills_frame(table_version("bills"), columns, start_date, end_date, batch_size)
+
+# --- Incremental bills snapshot ---
+# One columnar copy of the bills table per process, shared read-only by the dashboard and
+# reports: datetime64 created_at, float64 money and categorical text columns, ordered by
+# (created_at, id) and partitioned by fiscal year (April-March), like the server-side table
+# (sql/03_bills_fiscal_year_partitions.sql). The first sync loads everything; later syncs
+# fetch only rows after the watermark and append them to their year's partition, so closed
+# years are never copied again. Range reads concatenate only the overlapping partitions.
+# A delta does not see rows edited in place or back-dated by another client, so the snapshot
+# is reloaded in full once it is CACHE_TTL old (and by sync_bills(full=True)), which bounds
+# staleness like the other cached reads.
+
+# Columns the snapshot holds: what the register reports (pages/reports.py REPORT_BILL_COLUMNS)
+# and the dashboard table (pages/dashboard.py DASHBOARD_BILL_COLUMNS) read, plus the keyset.
+# Free-text columns such as amount_in_words stay in the database.
+SNAPSHOT_BILL_COLUMNS = [
+    "id", "bill_no", "created_at", "payee", "work", "status",
+    "billed_amount", "payable", "income_tax_amount", "deposit_amount", "cess_amount",
+]
+
+@st.cache_resource
+def _bills_snapshot():
+    return {"lock": threading.Lock(), "partitions": None, "watermark": None, "version": None,
+            "loaded_at": None, "local_ids": set()}
+
+def _record_inserted_bills(rows):
+    """Notes bills this process inserted (and already bumped the version for), so the delta
+    that picks them up does not count them as outside writes."""
+    snapshot = _bills_snapshot()
+    with snapshot["lock"]:
+        snapshot["local_ids"].update(row["id"] for row in rows if row.get("id") is not None)
+
+def sync_bills(full=False):
+    """Brings the process-wide bills snapshot up to date and returns its {fiscal year: frame}
+    partitions (treat as read-only)."""
+    snapshot = _bills_snapshot()
+    with snapshot["lock"]:
+        reload = snapshot["partitions"] is not None and (
+            full or time.monotonic() - snapshot["loaded_at"] >= CACHE_TTL)
+        after = None if reload or snapshot["partitions"] is None else snapshot["watermark"]
+        new_rows = [row for batch in iter_bills(SNAPSHOT_BILL_COLUMNS, after=after) for row in batch]
+
+        if after is None:
+            snapshot["partitions"] = _split_by_fiscal_year(bills_frame(new_rows, categorical=True)) if new_rows else {}
+            snapshot["watermark"] = None
+            snapshot["loaded_at"] = time.monotonic()
+            snapshot["local_ids"].clear()
+            if reload:
+                # Edits made elsewhere may be in it: cached bill reads are stale too
+                bump_table_version("bills")
+        elif new_rows:
+            partitions = dict(snapshot["partitions"])
+            for year, part in _split_by_fiscal_year(bills_frame(new_rows, categorical=True)).items():
+                partitions[year] = _concat_bills([partitions[year], part]) if year in partitions else part
+            snapshot["partitions"] = dict(sorted(partitions.items()))
+            new_ids = {row["id"] for row in new_rows}
+            if not new_ids <= snapshot["local_ids"]:
+                # Rows written by another client: other cached bill reads are stale too
+                bump_table_version("bills")
+            snapshot["local_ids"] -= new_ids
+        if new_rows:
+            snapshot["watermark"] = (new_rows[-1]["created_at"], new_rows[-1]["id"])
+        snapshot["version"] = table_version("bills")
+        return snapshot["partitions"]
+
+def _synced_partitions():
+    """The snapshot partitions, synced first if bills were written since the last sync or the
+    snapshot is due for its periodic reload."""
+    from .archive import archived_years # utils.archive imports this module
+    snapshot = _bills_snapshot()
+    if (snapshot["partitions"] is None or snapshot["version"] != table_version("bills")
+            or time.monotonic() - snapshot["loaded_at"] >= CACHE_TTL):
+        partitions = sync_bills()
+    else:
+        partitions = snapshot["partitions"]
+    archived = set(archived_years()).intersection(partitions)
+    if archived:
+        # Years moved to the archive since they were loaded: read from the files from now on
+        with snapshot["lock"]:
+            partitions = {year: part for year, part in snapshot["partitions"].items() if year not in archived}
+            snapshot["partitions"] = partitions
+            bump_table_version("bills")
+            snapshot["version"] = table_version("bills")
+    return partitions
+
+def bills_snapshot_version():
+    """Bills version once the snapshot is up to date: a cache key for data derived from it."""
+    _synced_partitions()
+    return table_version("bills")
+
+def get_bills_snapshot(start_date=None, end_date=None):
+    """Returns the bills snapshot (optionally one date range of it), delta-syncing first if bills
+    were written since the last sync. Only the fiscal-year partitions overlapping the range are
+    read; archived years are not included (see utils.archive). The frames are shared; do not
+    modify them."""
+    partitions = _synced_partitions()
+    years = fiscal_years_between(start_date, end_date, partitions)
+    if not years:
+        # Same columns as a non-empty read
+        return next(iter(partitions.values())).iloc[0:0] if partitions else bills_frame([], categorical=True)
+    return _concat_bills(bills_between(partitions[year], start_date, end_date) for year in years)
+
+def _normalize_key(value):
+    """Case-insensitive, whitespace-agnostic key used to match Workcodes and budget heads."""
+    return str(value).strip().lower()
+
+# Hash index over works_plan keyed by normalized Workcode, built once per table version.
+# Kept as a shared resource (not cache_data) so a lookup does not unpickle the whole index.
+@st.cache_resource(ttl=CACHE_TTL, max_entries=2)
+def _works_plan_index(version):
     supabase = init_supabase()
-    if not supabase: return []
-    return supabase.table("budget_plan").select("*").execute().data
+    if not supabase: return {}
+
+    index = {}
+    for item in supabase.table("works_plan").select("*").execute().data or []:
+        if item.get("Workcode"):
+            index.setdefault(_normalize_key(item["Workcode"]), []).append(item)
+    return index
 
 def get_work_details_from_works_plan(workcode_value):
-    supabase = init_supabase()
-    if not supabase: return []
+    if not workcode_value:
+        return []
+    # O(1) lookup; copy the rows so callers cannot mutate the shared index
+    return [dict(item) for item in _works_plan_index(table_version("works_plan")).get(_normalize_key(workcode_value), [])]
+
+# --- Budget hierarchy index for the Create Bill cascade ---
+# bill type -> major head -> scheme/detailed head -> {"entry": first budget row, "workcodes": [...]}
+# Keys are in sorted order so they can be used directly as dropdown options.
+def build_budget_tree(rows, scheme_column, major_head_column="Major Head"):
+    """Groups budget rows into major head -> scheme -> {entry, workcodes}.
+
+    The entry is the first row matching the exact major head and scheme. Workcodes are
+    matched case-insensitively and ignoring surrounding whitespace, as the form did.
+    """
+    tree, workcodes = {}, {}
+    for item in rows:
+        major_head, scheme, workcode = item.get(major_head_column), item.get(scheme_column), item.get("Workcode")
+        if not major_head:
+            continue
+        schemes = tree.setdefault(major_head, {})
+        if not scheme:
+            continue
+        if scheme not in schemes:
+            schemes[scheme] = item
+        if isinstance(workcode, str) and workcode.strip():
+            workcodes.setdefault((_normalize_key(major_head), _normalize_key(scheme)), set()).add(workcode.strip())
+
+    return {
+        major_head: {
+            scheme: {
+                "entry": entry,
+                "workcodes": sorted(workcodes.get((_normalize_key(major_head), _normalize_key(scheme)), ())),
+            }
+            for scheme, entry in sorted(schemes.items())
+        }
+        for major_head, schemes in sorted(tree.items())
+    }
+
+BUDGET_PLAN_INDEX_COLUMNS = ["Major Head", "Scheme", "Workcode", "Amount"]
+BUDGET_NP_INDEX_COLUMNS = ["Major Head", "Detailed Head", "Amount"]
+
+@st.cache_resource(ttl=CACHE_TTL, max_entries=4)
+def _budget_index(plan_version, np_version):
+    return {
+        "Plan": build_budget_tree(get_budget_plan(columns=BUDGET_PLAN_INDEX_COLUMNS), "Scheme"),
+        "Non Plan": build_budget_tree(get_budget_np(columns=BUDGET_NP_INDEX_COLUMNS), "Detailed Head"),
+    }
+
+def get_budget_index():
+    """Returns the budget hierarchy for both bill types, built once per budget table version (read-only)."""
+    return _budget_index(table_version("budget_plan"), table_version("budget_np"))
+
+def warm_budget_plan():
+    """Reads the budget_plan columns the budget index uses, so it can be fetched alongside budget_np."""
+    get_budget_plan(columns=BUDGET_PLAN_INDEX_COLUMNS)
+
+def warm_budget_np():
+    """Reads the budget_np columns the budget index uses, so it can be fetched alongside budget_plan."""
+    get_budget_np(columns=BUDGET_NP_INDEX_COLUMNS)
 
-    # Fetch all records from works_plan
-    result = supabase.table("works_plan").select("*").execute()
-    all_works_plan_data = result.data
+def warm_works_plan_index():
+    """Builds the Workcode index ahead of the first lookup (e.g. during a page prefetch)."""
+    _works_plan_index(table_version("works_plan"))
 
-    if not all_works_plan_data:
-        return [] # Return empty if no data fetched
+def load_concurrently(**loaders):
+    """Runs zero-argument loaders on a thread pool and returns {name: result}.
 
-    # Filter in Python using case-insensitive and whitespace-agnostic comparison
-    filtered_data = [
-        item for item in all_works_plan_data
-        if item.get("Workcode") and workcode_value and
-           str(item.get("Workcode")).strip().lower() == str(workcode_value).strip().lower()
-    ]
+    Page latency becomes roughly the slowest read instead of the sum of all of them.
+    Worker threads share the caller's Streamlit script context so cached readers work.
+    """
+    ctx = get_script_run_ctx()
 
-    return filtered_data
+    def run(loader):
+        if ctx:
+            add_script_run_ctx(threading.current_thread(), ctx)
+        return loader()
+
+    with ThreadPoolExecutor(max_workers=max(len(loaders), 1)) as pool:
+        futures = {name: pool.submit(run, loader) for name, loader in loaders.items()}
+        return {name: future.result() for name, future in futures.items()}
 
 def insert_bill(bill_data):
     supabase = init_supabase()
     if not supabase: return None # Indicate failure
-    return supabase.table("bills").insert(bill_data).execute()
+    result = supabase.table("bills").insert(bill_data).execute()
+    try:
+        # Fold the stored rows into the daily rollup read by the report summaries
+        if result.data:
+            supabase.rpc("apply_bills_to_rollup", {"bills": result.data}).execute()
+    except Exception as e:
+        st.warning(f"Bill saved, but the daily rollup was not updated ({e}). Run 'python -m utils.maintenance rebuild-rollup'.")
+    _record_inserted_bills(result.data or [])
+    bump_table_version("bills")
+    return result
+
+class PartialInsertError(Exception):
+    """A chunked insert failed after some chunks were stored; `inserted` holds the stored rows."""
+    def __init__(self, inserted):
+        super().__init__(f"{len(inserted)} bills were saved before the insert failed")
+        self.inserted = inserted
+
+def insert_bills(bills, chunk_size=500):
+    """Inserts many bills with one request per chunk; returns the stored rows.
+
+    Each chunk is folded into the daily rollup as soon as it is stored; if that fails the insert
+    carries on and one warning (as in insert_bill) asks for a rollup rebuild. If a chunk fails
+    to insert, the chunks before it stay saved: the error is raised as PartialInsertError (with
+    the failure as its __cause__) when some rows were stored, and as is when none were.
+    """
+    supabase = init_supabase()
+    if not supabase: return None
+    inserted = []
+    rollup_error = None
+    try:
+        for start in range(0, len(bills), chunk_size):
+            result = supabase.table("bills").insert(bills[start:start + chunk_size]).execute()
+            if result.data:
+                inserted.extend(result.data)
+                try:
+                    # Fold the stored rows into the daily rollup read by the report summaries
+                    supabase.rpc("apply_bills_to_rollup", {"bills": result.data}).execute()
+                except Exception as e:
+                    rollup_error = rollup_error or e
+    except Exception as e:
+        if inserted:
+            raise PartialInsertError(inserted) from e
+        raise
+    finally:
+        if rollup_error:
+            st.warning(f"Bills saved, but the daily rollup was not updated ({rollup_error}). Run 'python -m utils.maintenance rebuild-rollup'.")
+        if inserted:
+            _record_inserted_bills(inserted)
+            bump_table_version("bills")
+    return inserted
+
+def delete_bills(ids, chunk_size=500):
+    """Deletes bills by id, one request per chunk; returns the number deleted.
+
+    bills_daily_rollup is left as it is, so report totals still include the deleted bills
+    (this is used to move bills into the archive, not to cancel them).
+    """
+    supabase = init_supabase()
+    if not supabase: return 0
+    ids = list(ids)
+    deleted = 0
+    try:
+        for start in range(0, len(ids), chunk_size):
+            result = supabase.table("bills").delete().in_("id", ids[start:start + chunk_size]).execute()
+            deleted += len(result.data or [])
+    finally:
+        if deleted:
+            bump_table_version("bills")
+    return deleted
 
 def insert_contractor(contractor_data):
     supabase = init_supabase()
     if not supabase: return None
-    return supabase.table("contractors").insert(contractor_data).execute()
+    result = supabase.table("contractors").insert(contractor_data).execute()
+    bump_table_version("contractors")
+    return result
 
 def insert_work(work_data):
     supabase = init_supabase()
     if not supabase: return None
-    return supabase.table("works_plan").insert(work_data).execute()
+    result = supabase.table("works_plan").insert(work_data).execute()
+    bump_table_version("works_plan")
+    return result
 
 # --- User Management Functions ---
 
@@ -103,17 +554,36 @@ def add_user(username, hashed_password, role, allowed_pages=None):
     }
     try:
         # Consider adding more specific error handling for duplicate usernames etc.
-        return supabase.table("users_hydraulicuri").insert(user_data).execute()
+        result = supabase.table("users_hydraulicuri").insert(user_data).execute()
+        bump_table_version("users_hydraulicuri")
+        return result
     except Exception as e:
         st.error(f"Database error adding user: {e}")
         return None # Indicate failure
 
 def get_users():
     """Retrieves all users from the 'users_hydraulicuri' table, excluding passwords."""
-    supabase = init_supabase()
-    if not supabase: return []
     # Select only username and role for security
-    return supabase.table("users_hydraulicuri").select("username, role").execute().data
+    return _cached_select("users_hydraulicuri", table_version("users_hydraulicuri"), "username, role")
+
+@st.cache_data(ttl=CACHE_TTL, max_entries=64, show_spinner=False)
+def _cached_users_page(version, limit, offset):
+    supabase = init_supabase()
+    if not supabase: return [], 0
+    query = supabase.table("users_hydraulicuri") \
+                    .select("username, role, allowed_pages", count="exact") \
+                    .order("username")
+    if limit:
+        query = query.range(offset, offset + limit - 1)
+    result = query.execute()
+    return result.data, result.count or 0
+
+def get_users_with_permissions(limit=None, offset=0):
+    """Retrieves username, role and allowed_pages for a page of users in one query, excluding passwords.
+
+    Returns (users, total_count); with limit=None every user is returned.
+    """
+    return _cached_users_page(table_version("users_hydraulicuri"), limit, offset)
 
 # You might also need a function to get a specific user by username for login
 def get_user_by_username(username):
@@ -134,10 +604,12 @@ def update_user_permissions(username, allowed_pages):
         else:
             pages_to_set = list(allowed_pages)
 
-        return supabase.table("users_hydraulicuri") \
-                       .update({"allowed_pages": pages_to_set}) \
-                       .eq("username", username) \
-                       .execute()
+        result = supabase.table("users_hydraulicuri") \
+                         .update({"allowed_pages": pages_to_set}) \
+                         .eq("username", username) \
+                         .execute()
+        bump_table_version("users_hydraulicuri")
+        return result
     except Exception as e:
         st.error(f"Database error updating permissions for {username}: {e}")
         return None
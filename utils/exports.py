@@ -0,0 +1,88 @@
+"""Report exports that stream bills straight from the database into the output file."""
+import datetime
+import itertools
+import xlsxwriter
+from .archive import iter_archived_bills
+from .db import iter_bills
+
+def _total_deduction(row):
+    return sum(row.get(column) or 0 for column in ("income_tax_amount", "deposit_amount", "cess_amount"))
+
+# Register layouts: (header, bill column or function of the row, cell kind, column width)
+REGISTER_LAYOUTS = {
+    "Payment Register": [
+        ("Bill No", "bill_no", "text", 10),
+        ("Date", "created_at", "date", 12),
+        ("Payee", "payee", "text", 30),
+        ("Work", "work", "text", 30),
+        ("Amount", "payable", "money", 16),
+        ("Status", "status", "text", 10),
+    ],
+    "Deduction Register": [
+        ("Bill No", "bill_no", "text", 10),
+        ("Date", "created_at", "date", 12),
+        ("Payee", "payee", "text", 30),
+        ("Income Tax", "income_tax_amount", "money", 14),
+        ("Deposit", "deposit_amount", "money", 14),
+        ("Cess", "cess_amount", "money", 14),
+        ("Total Deduction", _total_deduction, "money", 16),
+    ],
+}
+
+def register_columns(report_type):
+    """Bill columns a register export reads."""
+    columns = [source for _, source, _, _ in REGISTER_LAYOUTS[report_type] if isinstance(source, str)]
+    if any(callable(source) for _, source, _, _ in REGISTER_LAYOUTS[report_type]):
+        columns += ["income_tax_amount", "deposit_amount", "cess_amount"]
+    return list(dict.fromkeys(columns))
+
+def _bill_date(value):
+    """created_at as a naive datetime at midnight (the reports are by calendar date)."""
+    created_at = value if isinstance(value, datetime.datetime) else datetime.datetime.fromisoformat(value)
+    return datetime.datetime.combine(created_at.date(), datetime.time())
+
+def write_register_xlsx(report_type, start_date, end_date, output, batch_size=1000):
+    """Writes a bills register to output (path or binary file) and returns the row count.
+
+    Rows are read with iter_archived_bills and iter_bills and written one at a time in
+    xlsxwriter's constant_memory mode, so only one batch of bills and one worksheet row are
+    held in memory at any point.
+    """
+    layout = REGISTER_LAYOUTS[report_type]
+    workbook = xlsxwriter.Workbook(output, {"constant_memory": True})
+    try:
+        worksheet = workbook.add_worksheet("Report")
+        formats = {
+            "header": workbook.add_format({"bold": True, "bottom": 1}),
+            "money": workbook.add_format({"num_format": "₹#,##0.00"}),
+            "date": workbook.add_format({"num_format": "dd/mm/yyyy"}),
+            "text": None,
+        }
+        for column_index, (header, _, _, width) in enumerate(layout):
+            worksheet.set_column(column_index, column_index, width)
+            worksheet.write_string(0, column_index, header, formats["header"])
+        worksheet.freeze_panes(1, 0)
+
+        row_index = 0
+        columns = register_columns(report_type)
+        # Archived fiscal years come first (they are older than anything left in the database)
+        batches = itertools.chain(
+            iter_archived_bills(columns, start_date, end_date, batch_size=batch_size),
+            iter_bills(columns, start_date, end_date, batch_size=batch_size),
+        )
+        for batch in batches:
+            for bill in batch:
+                row_index += 1
+                for column_index, (_, source, kind, _) in enumerate(layout):
+                    value = source(bill) if callable(source) else bill.get(source)
+                    if value is None or value == "":
+                        continue
+                    if kind == "date":
+                        worksheet.write_datetime(row_index, column_index, _bill_date(value), formats["date"])
+                    elif kind == "money":
+                        worksheet.write_number(row_index, column_index, float(value), formats["money"])
+                    else:
+                        worksheet.write(row_index, column_index, value)
+    finally:
+        workbook.close()
+    return row_index
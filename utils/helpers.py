@@ -1,12 +1,103 @@
 from num2words import num2words
 import datetime
+import functools
+import math
+from decimal import Decimal
+import numpy as np
+import pandas as pd
 
+# Indian numbering words, laid out like num2words' en_IN converter
+_ONES = [
+    "zero", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine", "ten",
+    "eleven", "twelve", "thirteen", "fourteen", "fifteen", "sixteen", "seventeen", "eighteen", "nineteen",
+]
+_TENS = ["", "", "twenty", "thirty", "forty", "fifty", "sixty", "seventy", "eighty", "ninety"]
+_INDIAN_UNITS = [(10 ** 7, "crore"), (10 ** 5, "lakh"), (1000, "thousand")]
+_MAX_WORDS_VALUE = 1000 * 10 ** 7 # num2words en_IN limit (1000 crore)
+
+def _words_below_hundred(number):
+    if number < 20:
+        return _ONES[number]
+    tens, units = divmod(number, 10)
+    return f"{_TENS[tens]}-{_ONES[units]}" if units else _TENS[tens]
+
+def _words_below_thousand(number):
+    hundreds, rest = divmod(number, 100)
+    if not hundreds:
+        return _words_below_hundred(rest)
+    words = f"{_ONES[hundreds]} hundred"
+    return f"{words} and {_words_below_hundred(rest)}" if rest else words
+
+def _cardinal_words(number):
+    """Words for a non-negative integer below 1000 crore, e.g. 'one lakh, ten thousand and one'."""
+    if number == 0:
+        return "zero"
+    words = ""
+    for unit, name in _INDIAN_UNITS:
+        count, number = divmod(number, unit)
+        if count:
+            words += (", " if words else "") + f"{_words_below_thousand(count)} {name}"
+    if number:
+        # A bare tens/units remainder is joined with 'and', a hundreds part with a comma
+        separator = " and " if number < 100 else ", "
+        words += (separator if words else "") + _words_below_thousand(number)
+    return words
+
+def _integer_words(number):
+    sign = "minus " if number < 0 else ""
+    number = abs(number)
+    if number >= _MAX_WORDS_VALUE:
+        raise OverflowError(f"abs({number}) must be less than {_MAX_WORDS_VALUE}.")
+    return sign + _cardinal_words(int(number))
+
+def _float_words(amount):
+    # Same split as num2words: the digits after the point are read one by one
+    whole = int(amount)
+    precision = abs(Decimal(str(amount)).as_tuple().exponent)
+    fraction = abs(amount - whole) * 10 ** precision
+    fraction = int(round(fraction)) if abs(round(fraction) - fraction) < 0.01 else int(math.floor(fraction))
+    digits = str(fraction).rjust(precision, "0")
+    return " ".join([_integer_words(whole), "point"] + [_ONES[int(digit)] for digit in digits[:precision]])
+
+@functools.lru_cache(maxsize=65536)
 def amount_in_words(amount):
+    """Amount in Indian-system words (lakh/crore), e.g. 'One Lakh, Ten Thousand And One'.
+
+    Same text as num2words(amount, lang='en_IN').title(), built without the generic converter
+    and memoized, since bill amounts repeat. Values it does not handle natively (strings,
+    Decimals, NaN, infinity) are passed to num2words.
+    """
+    if isinstance(amount, (int, float, np.integer, np.floating)) and math.isfinite(amount):
+        if int(amount) == amount:
+            return _integer_words(amount).title()
+        return _float_words(float(amount)).title()
     return num2words(amount, lang='en_IN').title()
 
 def current_date():
     return datetime.datetime.now().isoformat()
 
+def fiscal_year(value):
+    """Fiscal year (1 April - 31 March) a date falls in, named by its starting year: 2024 for 2024-25."""
+    return value.year if value.month >= 4 else value.year - 1
+
+def fiscal_year_bounds(year):
+    """First and last day of a fiscal year."""
+    return datetime.date(year, 4, 1), datetime.date(year + 1, 3, 31)
+
+def fiscal_years_between(start_date=None, end_date=None, years=None):
+    """Fiscal years overlapping [start_date, end_date]; open ends are bounded by the given years."""
+    years = sorted(years) if years is not None else None
+    first = fiscal_year(start_date) if start_date else (years[0] if years else None)
+    last = fiscal_year(end_date) if end_date else (years[-1] if years else None)
+    if first is None or last is None:
+        return []
+    if years is not None:
+        return [year for year in years if first <= year <= last]
+    return list(range(first, last + 1))
+
+def fiscal_year_label(year):
+    return f"{year}-{(year + 1) % 100:02d}"
+
 def calculate_deductions(payable, income_tax_percent, deposit_percent, cess_percent, restricted_to_amount, scheme, cgst_percent, sgst_percent):
     # Determine the base amount for all tax calculations
     calculation_base_for_taxes = restricted_to_amount
@@ -33,3 +124,96 @@ def calculate_deductions(payable, income_tax_percent, deposit_percent, cess_perc
         # but are not subtracted for this specific net_amount calculation as per user feedback.
         
     return income_tax, deposit, cess, cgst_amount, sgst_amount, total_deduction_for_record, net_amount
+
+def calculate_deductions_array(payable, income_tax_percent, deposit_percent, cess_percent, restricted_to_amount, scheme, cgst_percent, sgst_percent):
+    """calculate_deductions for many bills at once.
+
+    Arguments may be scalars or equal-length sequences/Series; the same float operations and
+    half-to-even rounding as the scalar version are applied element-wise, so results match it
+    exactly. Returns the same 7 values as float64 arrays.
+    """
+    restricted_to_amount = np.asarray(restricted_to_amount, dtype=np.float64)
+    schemes = np.broadcast_to(np.asarray(scheme, dtype=object), restricted_to_amount.shape).ravel()
+    is_jjm_scheme = pd.Series(schemes).fillna("").astype(str).str.upper().eq("JJM").to_numpy().reshape(restricted_to_amount.shape)
+
+    # Same base as the scalar version: (restricted_to * 100) / 118 for JJM
+    calculation_base_for_taxes = np.where(is_jjm_scheme, (restricted_to_amount * 100) / 118, restricted_to_amount)
+
+    def component(percent):
+        return np.rint(calculation_base_for_taxes * (np.asarray(percent, dtype=np.float64) / 100))
+
+    income_tax = component(income_tax_percent)
+    deposit = component(deposit_percent)
+    cess = component(cess_percent)
+    cgst_amount = component(cgst_percent)
+    sgst_amount = component(sgst_percent)
+
+    total_deduction_for_record = income_tax + deposit + cess + cgst_amount + sgst_amount
+
+    # JJM nets off every component; other schemes only income tax and deposit
+    net_amount = np.where(
+        is_jjm_scheme,
+        restricted_to_amount - total_deduction_for_record,
+        restricted_to_amount - income_tax - deposit,
+    )
+
+    return income_tax, deposit, cess, cgst_amount, sgst_amount, total_deduction_for_record, net_amount
+
+# Bill columns the deduction rules read, and the columns they produce (in calculate_deductions order)
+DEDUCTION_RATE_COLUMNS = ["income_tax_percent", "deposit_percent", "cess_percent", "cgst_percent", "sgst_percent"]
+DEDUCTION_AMOUNT_COLUMNS = [
+    "income_tax_amount", "deposit_amount", "cess_amount", "cgst_amount", "sgst_amount",
+    "total_deduction", "net_amount",
+]
+
+def calculate_deductions_frame(bills, **rates):
+    """Deduction amounts for a DataFrame of bills, as a frame of DEDUCTION_AMOUNT_COLUMNS.
+
+    Reads restricted_to_amount, scheme and the *_percent columns (missing rates count as 0).
+    Keyword rates replace a column for what-if runs, e.g. deposit_percent=5 or a Series.
+    """
+    unknown = set(rates) - set(DEDUCTION_RATE_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown rate column(s): {', '.join(sorted(unknown))}")
+
+    def rate(column):
+        if column in rates:
+            return np.broadcast_to(np.asarray(rates[column], dtype=np.float64), (len(bills),))
+        if column not in bills.columns:
+            return np.zeros(len(bills))
+        return pd.to_numeric(bills[column], errors="coerce").fillna(0).to_numpy(dtype=np.float64)
+
+    restricted_to_amount = pd.to_numeric(bills["restricted_to_amount"], errors="coerce").to_numpy(dtype=np.float64)
+    scheme = bills["scheme"].to_numpy(dtype=object) if "scheme" in bills.columns else None
+    results = calculate_deductions_array(
+        payable=restricted_to_amount, # Not used by the rules; kept for the shared signature
+        income_tax_percent=rate("income_tax_percent"),
+        deposit_percent=rate("deposit_percent"),
+        cess_percent=rate("cess_percent"),
+        restricted_to_amount=restricted_to_amount,
+        scheme=scheme,
+        cgst_percent=rate("cgst_percent"),
+        sgst_percent=rate("sgst_percent"),
+    )
+    return pd.DataFrame(dict(zip(DEDUCTION_AMOUNT_COLUMNS, results)), index=bills.index)
+
+def audit_deductions(bills, tolerance=0.005):
+    """Stored deduction amounts that differ from a recalculation.
+
+    Returns one row per mismatch: the bill id, the column, the stored and the recalculated value.
+    """
+    recalculated = calculate_deductions_frame(bills)
+    mismatches = []
+    for column in DEDUCTION_AMOUNT_COLUMNS:
+        stored = pd.to_numeric(bills[column], errors="coerce") if column in bills.columns else pd.Series(np.nan, index=bills.index)
+        differs = ~np.isclose(stored, recalculated[column], rtol=0, atol=tolerance)
+        if differs.any():
+            mismatches.append(pd.DataFrame({
+                "id": bills["id"][differs].to_numpy() if "id" in bills.columns else bills.index[differs],
+                "column": column,
+                "stored": stored[differs].to_numpy(),
+                "recalculated": recalculated[column][differs].to_numpy(),
+            }))
+    if not mismatches:
+        return pd.DataFrame(columns=["id", "column", "stored", "recalculated"])
+    return pd.concat(mismatches, ignore_index=True).sort_values(["id", "column"], ignore_index=True)
@@ -0,0 +1,656 @@
+"""Local SQLite stand-in for the Supabase client.
+
+``LocalClient`` implements the small part of the supabase-py query builder that
+``utils.db`` relies on (``table().select/insert/update/delete``, the basic filters and ``or_``,
+``order``/``limit``/``range``, ``execute().data`` and ``rpc`` for the functions in
+``sql/``), backed by SQLite with the
+same table and column names as the hosted project. ``utils.db.init_supabase``
+returns it when ``DB_BACKEND=sqlite``, which gives an offline development mode
+and repeatable benchmarks without a live Supabase project.
+
+Seed a database for local runs with::
+
+    python -m utils.local_db seed --path local.db --bills 50000
+"""
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import random
+import sqlite3
+import threading
+from dotenv import load_dotenv
+from .helpers import calculate_deductions, DEDUCTION_AMOUNT_COLUMNS
+
+# Column name -> declared type, per table. JSON and BOOLEAN columns are encoded
+# on write and decoded on read so rows round-trip like PostgREST responses.
+SCHEMA = {
+    "contractors": {
+        "id": "INTEGER PRIMARY KEY AUTOINCREMENT",
+        "name": "TEXT",
+        "parentage": "TEXT",
+        "resident": "TEXT",
+        "registration": "TEXT",
+        "class": "TEXT",
+        "pan": "TEXT",
+        "gstin": "TEXT",
+        "account_no": "TEXT",
+        "created_at": "TEXT",
+    },
+    "works_plan": {
+        "id": "INTEGER PRIMARY KEY AUTOINCREMENT",
+        "Workcode": "TEXT",
+        "Nomenclature": "TEXT",
+        "Allot No": "TEXT",
+        "Allot Dt": "TEXT",
+        "Allot Amt": "REAL",
+        "AAA No": "TEXT",
+        "AAA Dt": "TEXT",
+        "AAA Amt": "REAL",
+        "TS No": "TEXT",
+        "TS Dt": "TEXT",
+        "TS Amt": "REAL",
+        "Agr No": "TEXT",
+        "LOI No": "TEXT",
+        "LOI Dt": "TEXT",
+        "TOC": "INTEGER",
+        "DOS": "TEXT",
+        "DOC": "TEXT",
+    },
+    "budget_plan": {
+        "id": "INTEGER PRIMARY KEY AUTOINCREMENT",
+        "Major Head": "TEXT",
+        "Scheme": "TEXT",
+        "Workcode": "TEXT",
+        "Amount": "REAL",
+    },
+    "budget_np": {
+        "id": "INTEGER PRIMARY KEY AUTOINCREMENT",
+        "Major Head": "TEXT",
+        "Detailed Head": "TEXT",
+        "Amount": "REAL",
+    },
+    "bills": {
+        "id": "INTEGER PRIMARY KEY AUTOINCREMENT",
+        "bill_no": "INTEGER",
+        "payee": "TEXT",
+        "payee_id": "INTEGER",
+        "work": "TEXT",
+        "work_id": "INTEGER",
+        "bill_type": "TEXT",
+        "major_head": "TEXT",
+        "scheme": "TEXT",
+        "nomenclature": "TEXT",
+        "billed_amount": "REAL",
+        "deduct_payments": "REAL",
+        "payable": "REAL",
+        "restricted_to_amount": "REAL",
+        "income_tax_amount": "REAL",
+        "deposit_amount": "REAL",
+        "cess_amount": "REAL",
+        "cgst_amount": "REAL",
+        "sgst_amount": "REAL",
+        "income_tax_percent": "REAL",
+        "deposit_percent": "REAL",
+        "cess_percent": "REAL",
+        "cgst_percent": "REAL",
+        "sgst_percent": "REAL",
+        "cc_bill": "TEXT",
+        "final_bill": "BOOLEAN",
+        "total_deduction": "REAL",
+        "net_amount": "REAL",
+        "amount_in_words": "TEXT",
+        "status": "TEXT",
+        "created_at": "TEXT",
+    },
+    "bills_daily_rollup": {
+        "day": "TEXT NOT NULL",
+        "payee": "TEXT NOT NULL DEFAULT ''",
+        "scheme": "TEXT NOT NULL DEFAULT ''",
+        "major_head": "TEXT NOT NULL DEFAULT ''",
+        "bill_type": "TEXT NOT NULL DEFAULT ''",
+        "bill_count": "INTEGER NOT NULL DEFAULT 0",
+        "billed_amount": "REAL NOT NULL DEFAULT 0",
+        "payable": "REAL NOT NULL DEFAULT 0",
+        "net_amount": "REAL NOT NULL DEFAULT 0",
+        "income_tax_amount": "REAL NOT NULL DEFAULT 0",
+        "deposit_amount": "REAL NOT NULL DEFAULT 0",
+        "cess_amount": "REAL NOT NULL DEFAULT 0",
+        "cgst_amount": "REAL NOT NULL DEFAULT 0",
+        "sgst_amount": "REAL NOT NULL DEFAULT 0",
+        "total_deduction": "REAL NOT NULL DEFAULT 0",
+        "last_created_at": "TEXT",
+    },
+    "users_hydraulicuri": {
+        "id": "INTEGER PRIMARY KEY AUTOINCREMENT",
+        "username": "TEXT UNIQUE NOT NULL",
+        "hashed_password": "TEXT",
+        "role": "TEXT",
+        "allowed_pages": "JSON",
+    },
+}
+
+# Extra DDL run after the tables exist (indexes, triggers emulating DB defaults)
+SCHEMA_EXTRAS = [
+    'CREATE INDEX IF NOT EXISTS bills_created_at_id_idx ON "bills" ("created_at", "id")',
+    'CREATE INDEX IF NOT EXISTS bills_status_idx ON "bills" ("status")',
+    'CREATE INDEX IF NOT EXISTS works_plan_workcode_idx ON "works_plan" ("Workcode")',
+    '''CREATE UNIQUE INDEX IF NOT EXISTS bills_daily_rollup_key
+       ON "bills_daily_rollup" ("day", "payee", "scheme", "major_head", "bill_type")''',
+    # bill_no is a serial in the hosted table
+    '''CREATE TRIGGER IF NOT EXISTS bills_bill_no_default AFTER INSERT ON "bills"
+       WHEN NEW."bill_no" IS NULL
+       BEGIN UPDATE "bills" SET "bill_no" = NEW."id" WHERE "id" = NEW."id"; END''',
+]
+
+
+def quote_ident(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def parse_columns(columns):
+    """Splits a PostgREST select list ('a, "Allot No", b') into column names."""
+    names, current, quoted = [], "", False
+    for char in ",".join(columns):
+        if char == '"':
+            quoted = not quoted
+        elif char == "," and not quoted:
+            names.append(current.strip())
+            current = ""
+        else:
+            current += char
+    names.append(current.strip())
+    return [name for name in names if name]
+
+
+# PostgREST operator -> SQL operator, for filters given as strings (or_)
+OPERATORS = {"eq": "=", "neq": "!=", "gt": ">", "gte": ">=", "lt": "<", "lte": "<=", "like": "LIKE", "ilike": "LIKE"}
+
+
+def _split_top_level(text):
+    parts, current, depth, quoted = [], "", 0, False
+    for char in text:
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        if char == "," and depth == 0 and not quoted:
+            parts.append(current.strip())
+            current = ""
+        else:
+            current += char
+    parts.append(current.strip())
+    return [part for part in parts if part]
+
+
+def parse_logic_tree(filters, joiner="OR"):
+    """Translates a PostgREST logic tree ('a.gt.1,and(b.eq."x",c.lt.2)') into SQL and params."""
+    clauses, params = [], []
+    for part in _split_top_level(filters):
+        keyword = part.split("(", 1)[0]
+        if keyword in ("and", "or") and part.endswith(")"):
+            sql, sub_params = parse_logic_tree(part[len(keyword) + 1:-1], keyword.upper())
+        else:
+            column, op, value = part.split(".", 2)
+            if len(value) >= 2 and value[0] == value[-1] == '"':
+                value = value[1:-1]
+            if op == "is":
+                sql, sub_params = f"{quote_ident(column)} IS {'NULL' if value == 'null' else value.upper()}", []
+            else:
+                sql, sub_params = f"{quote_ident(column)} {OPERATORS[op]} ?", [value.replace("*", "%") if "like" in op else value]
+        clauses.append(sql)
+        params.extend(sub_params)
+    return "(" + f" {joiner} ".join(clauses) + ")", params
+
+
+def _encode(value):
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return value
+
+
+# --- SQLite equivalents of the Postgres functions in sql/, served by LocalClient.rpc ---
+
+BILL_TOTAL_COLUMNS = [
+    "billed_amount", "payable", "net_amount", "income_tax_amount", "deposit_amount",
+    "cess_amount", "cgst_amount", "sgst_amount", "total_deduction",
+]
+ROLLUP_KEYS = ["payee", "scheme", "major_head", "bill_type"]
+ROLLUP_COLUMNS = ["day"] + ROLLUP_KEYS + ["bill_count"] + BILL_TOTAL_COLUMNS + ["last_created_at"]
+
+
+def _rollup_upsert_sql():
+    additions = ", ".join(f'"{column}" = "{column}" + excluded."{column}"' for column in ["bill_count"] + BILL_TOTAL_COLUMNS)
+    return (f'INSERT INTO "bills_daily_rollup" ({", ".join(quote_ident(c) for c in ROLLUP_COLUMNS)}) '
+            f'VALUES ({", ".join("?" for _ in ROLLUP_COLUMNS)}) '
+            f'ON CONFLICT ("day", {", ".join(quote_ident(c) for c in ROLLUP_KEYS)}) DO UPDATE SET {additions}, '
+            f'"last_created_at" = max("last_created_at", excluded."last_created_at")')
+
+
+def rpc_apply_bills_to_rollup(client, bills):
+    """sql/01_bills_daily_rollup.sql: folds newly inserted bills into the daily rollup."""
+    rows = []
+    for bill in bills:
+        created_at = bill.get("created_at")
+        if not created_at:
+            continue
+        rows.append(
+            [str(created_at)[:10]]
+            + [bill.get(key) or "" for key in ROLLUP_KEYS]
+            + [1 if bill.get("payable") is not None else 0]
+            + [bill.get(column) or 0 for column in BILL_TOTAL_COLUMNS]
+            + [created_at]
+        )
+    client._execute_many(_rollup_upsert_sql(), rows)
+
+
+def rpc_rebuild_bills_rollup(client):
+    """sql/01_bills_daily_rollup.sql: recomputes the rollup from bills, returns its row count."""
+    keys_sql = ", ".join(f"COALESCE(\"{key}\", '')" for key in ROLLUP_KEYS)
+    sums_sql = ", ".join(f'COALESCE(SUM("{column}"), 0)' for column in BILL_TOTAL_COLUMNS)
+    client._execute_script([
+        ('DELETE FROM "bills_daily_rollup"', []),
+        (f'INSERT INTO "bills_daily_rollup" ({", ".join(quote_ident(c) for c in ROLLUP_COLUMNS)}) '
+         f'SELECT substr("created_at", 1, 10), {keys_sql}, COUNT("payable"), {sums_sql}, MAX("created_at") '
+         f'FROM "bills" WHERE "created_at" IS NOT NULL GROUP BY 1, 2, 3, 4, 5', []),
+    ])
+    return client._scalar('SELECT COUNT(*) FROM "bills_daily_rollup"', [])
+
+
+ROLLUP_GROUPS = {
+    "payee": "NULLIF(\"payee\", '')",
+    "scheme": "NULLIF(\"scheme\", '')",
+    "major_head": "NULLIF(\"major_head\", '')",
+    "bill_type": "NULLIF(\"bill_type\", '')",
+    "day": '"day"',
+}
+
+
+def rpc_bill_totals(client, group_by, start_date=None, end_date=None):
+    """sql/02_bill_totals.sql: rollup totals grouped by payee, scheme, major head, bill type or day."""
+    if group_by not in ROLLUP_GROUPS:
+        raise ValueError(f"Unsupported group_by '{group_by}'")
+    clauses, params = [], []
+    if start_date:
+        clauses.append('"day" >= ?')
+        params.append(start_date)
+    if end_date:
+        clauses.append('"day" <= ?')
+        params.append(end_date)
+    where_sql = (" WHERE " + " AND ".join(clauses)) if clauses else ""
+    sums_sql = ", ".join(f'SUM("{column}") AS "{column}"' for column in BILL_TOTAL_COLUMNS)
+    sql = (f'SELECT * FROM (SELECT {ROLLUP_GROUPS[group_by]} AS group_key, SUM("bill_count") AS bill_count, '
+           f'{sums_sql}, MAX("last_created_at") AS last_created_at FROM "bills_daily_rollup"{where_sql} GROUP BY 1) '
+           f'WHERE group_key IS NOT NULL ORDER BY group_key')
+    return client._fetch_rows(sql, params)
+
+
+RPC_FUNCTIONS = {
+    "bill_totals": rpc_bill_totals,
+    "apply_bills_to_rollup": rpc_apply_bills_to_rollup,
+    "rebuild_bills_rollup": rpc_rebuild_bills_rollup,
+}
+
+
+class LocalResponse:
+    """Mirrors the ``data``/``count`` attributes of postgrest's APIResponse."""
+
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+class LocalQuery:
+    """Fluent query builder over one SQLite table."""
+
+    def __init__(self, client, table):
+        if table not in SCHEMA:
+            raise ValueError(f"Unknown table '{table}'")
+        self._client = client
+        self._table = table
+        self._action = "select"
+        self._columns = ["*"]
+        self._payload = None
+        self._where = []
+        self._params = []
+        self._order = []
+        self._limit = None
+        self._offset = None
+        self._count = None
+        self._head = False
+
+    # --- actions ---
+    def select(self, *columns, count=None, head=None):
+        self._action = "select"
+        self._columns = parse_columns(columns or ("*",))
+        self._count = count # "exact", "planned" and "estimated" are all exact here
+        self._head = bool(head)
+        return self
+
+    def insert(self, json, **kwargs):
+        self._action = "insert"
+        self._payload = json if isinstance(json, list) else [json]
+        return self
+
+    def update(self, json, **kwargs):
+        self._action = "update"
+        self._payload = json
+        return self
+
+    def delete(self, **kwargs):
+        self._action = "delete"
+        return self
+
+    # --- filters ---
+    def _filter(self, column, op, value):
+        self._where.append(f"{quote_ident(column)} {op} ?")
+        self._params.append(_encode(value))
+        return self
+
+    def eq(self, column, value):
+        return self._filter(column, "=", value)
+
+    def neq(self, column, value):
+        return self._filter(column, "!=", value)
+
+    def gt(self, column, value):
+        return self._filter(column, ">", value)
+
+    def gte(self, column, value):
+        return self._filter(column, ">=", value)
+
+    def lt(self, column, value):
+        return self._filter(column, "<", value)
+
+    def lte(self, column, value):
+        return self._filter(column, "<=", value)
+
+    def ilike(self, column, pattern):
+        # SQLite LIKE is case-insensitive for ASCII; PostgREST also accepts '*' wildcards
+        return self._filter(column, "LIKE", str(pattern).replace("*", "%"))
+
+    def in_(self, column, values):
+        values = list(values)
+        if not values:
+            self._where.append("0")
+            return self
+        self._where.append(f"{quote_ident(column)} IN ({', '.join('?' for _ in values)})")
+        self._params.extend(_encode(value) for value in values)
+        return self
+
+    def or_(self, filters, **kwargs):
+        sql, params = parse_logic_tree(filters, "OR")
+        self._where.append(sql)
+        self._params.extend(params)
+        return self
+
+    # --- modifiers ---
+    def order(self, column, *, desc=False, **kwargs):
+        self._order.append(f"{quote_ident(column)} {'DESC' if desc else 'ASC'}")
+        return self
+
+    def limit(self, size, **kwargs):
+        self._limit = size
+        return self
+
+    def offset(self, size):
+        self._offset = size
+        return self
+
+    def range(self, start, end, **kwargs):
+        self._offset = start
+        self._limit = end - start + 1
+        return self
+
+    # --- execution ---
+    def _where_sql(self):
+        return f" WHERE {' AND '.join(self._where)}" if self._where else ""
+
+    def _select_sql(self):
+        if self._columns == ["*"]:
+            columns_sql = "*"
+        else:
+            columns_sql = ", ".join(quote_ident(column) for column in self._columns)
+        sql = f"SELECT {columns_sql} FROM {quote_ident(self._table)}{self._where_sql()}"
+        if self._order:
+            sql += f" ORDER BY {', '.join(self._order)}"
+        if self._limit is not None or self._offset is not None:
+            sql += f" LIMIT {int(self._limit) if self._limit is not None else -1}"
+            sql += f" OFFSET {int(self._offset or 0)}"
+        return sql
+
+    def execute(self):
+        if self._action == "insert":
+            return LocalResponse(self._client._insert(self._table, self._payload))
+        if self._action == "update":
+            return LocalResponse(self._client._update(self._table, self._payload, self._where_sql(), self._params))
+        if self._action == "delete":
+            return LocalResponse(self._client._delete(self._table, self._where_sql(), self._params))
+        count = None
+        if self._count:
+            count = self._client._scalar(f"SELECT COUNT(*) FROM {quote_ident(self._table)}{self._where_sql()}", self._params)
+        if self._head:
+            return LocalResponse([], count)
+        return LocalResponse(self._client._fetch(self._table, self._select_sql(), self._params), count)
+
+
+class LocalRpc:
+    """Deferred call returned by LocalClient.rpc, executed like a query."""
+
+    def __init__(self, client, function, params):
+        if function not in RPC_FUNCTIONS:
+            raise ValueError(f"Unknown function '{function}'")
+        self._client = client
+        self._function = function
+        self._params = params or {}
+
+    def execute(self):
+        return LocalResponse(RPC_FUNCTIONS[self._function](self._client, **self._params))
+
+
+class LocalClient:
+    """SQLite-backed replacement for ``supabase.Client`` (tables only)."""
+
+    def __init__(self, path=":memory:"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self.create_schema()
+
+    def create_schema(self):
+        with self._lock, self._conn:
+            for table, columns in SCHEMA.items():
+                columns_sql = ", ".join(f"{quote_ident(name)} {kind}" for name, kind in columns.items())
+                self._conn.execute(f"CREATE TABLE IF NOT EXISTS {quote_ident(table)} ({columns_sql})")
+            for statement in SCHEMA_EXTRAS:
+                self._conn.execute(statement)
+
+    def table(self, name):
+        return LocalQuery(self, name)
+
+    def rpc(self, function, params=None):
+        return LocalRpc(self, function, params)
+
+    def _decode(self, table, row):
+        record = dict(row)
+        for column, kind in SCHEMA[table].items():
+            value = record.get(column)
+            if value is None:
+                continue
+            if kind == "JSON":
+                record[column] = json.loads(value)
+            elif kind == "BOOLEAN":
+                record[column] = bool(value)
+        return record
+
+    def _fetch(self, table, sql, params):
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._decode(table, row) for row in rows]
+
+    def _fetch_rows(self, sql, params):
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params).fetchall()]
+
+    def _execute_many(self, sql, rows):
+        with self._lock, self._conn:
+            self._conn.executemany(sql, rows)
+
+    def _execute_script(self, statements):
+        with self._lock, self._conn:
+            for sql, params in statements:
+                self._conn.execute(sql, params)
+
+    def _scalar(self, sql, params):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()[0]
+
+    def _insert(self, table, rows):
+        inserted_ids = []
+        with self._lock, self._conn:
+            for row in rows:
+                columns = list(row)
+                sql = (f"INSERT INTO {quote_ident(table)} ({', '.join(quote_ident(c) for c in columns)}) "
+                       f"VALUES ({', '.join('?' for _ in columns)})")
+                inserted_ids.append(self._conn.execute(sql, [_encode(row[c]) for c in columns]).lastrowid)
+        return self._rows_by_id(table, inserted_ids)
+
+    def _update(self, table, values, where_sql, params):
+        with self._lock, self._conn:
+            ids = [row[0] for row in self._conn.execute(f"SELECT id FROM {quote_ident(table)}{where_sql}", params)]
+            if ids:
+                assignments = ", ".join(f"{quote_ident(column)} = ?" for column in values)
+                self._conn.executemany(
+                    f"UPDATE {quote_ident(table)} SET {assignments} WHERE id = ?",
+                    [[_encode(value) for value in values.values()] + [row_id] for row_id in ids]
+                )
+        return self._rows_by_id(table, ids)
+
+    def _delete(self, table, where_sql, params):
+        rows = self._fetch(table, f"SELECT * FROM {quote_ident(table)}{where_sql}", params)
+        with self._lock, self._conn:
+            self._conn.execute(f"DELETE FROM {quote_ident(table)}{where_sql}", params)
+        return rows
+
+    def _rows_by_id(self, table, ids):
+        if not ids:
+            return []
+        placeholders = ", ".join("?" for _ in ids)
+        return self._fetch(table, f"SELECT * FROM {quote_ident(table)} WHERE id IN ({placeholders}) ORDER BY id", ids)
+
+
+# --- Seeding for local development and benchmarks ---
+
+def seed(client, bills=1000, contractors=200, works=500, seed_value=42):
+    """Fills an empty database with deterministic synthetic data."""
+    rng = random.Random(seed_value)
+    today = datetime.datetime.now()
+
+    admin_user = os.getenv("ADMIN_USER", "admin")
+    admin_pass = os.getenv("ADMIN_PASS", "admin")
+    client.table("users_hydraulicuri").insert({
+        "username": admin_user,
+        "hashed_password": hashlib.sha256(admin_pass.encode()).hexdigest(),
+        "role": "admin",
+        "allowed_pages": None,
+    }).execute()
+
+    payees = [f"Contractor {i:04d}" for i in range(contractors)]
+    client.table("contractors").insert([{
+        "name": name,
+        "class": rng.choice("ABCDE"),
+        "account_no": f"{rng.randrange(10**11, 10**12)}",
+        "pan": f"ABCDE{i:04d}F",
+        "created_at": today.isoformat(),
+    } for i, name in enumerate(payees)]).execute()
+
+    major_heads = [f"{4700 + i}" for i in range(5)]
+    schemes = ["JJM", "CAPEX", "NABARD", "District Plan", "UT Sector"]
+    workcodes = [f"WC-{i:05d}" for i in range(works)]
+    client.table("budget_plan").insert([{
+        "Major Head": rng.choice(major_heads),
+        "Scheme": rng.choice(schemes),
+        "Workcode": workcode,
+        "Amount": float(rng.randrange(10, 500) * 100000),
+    } for workcode in workcodes]).execute()
+    client.table("budget_np").insert([{
+        "Major Head": major_head,
+        "Detailed Head": f"{major_head}-{detail:02d}",
+        "Amount": float(rng.randrange(10, 200) * 100000),
+    } for major_head in major_heads for detail in range(1, 6)]).execute()
+    client.table("works_plan").insert([{
+        "Workcode": workcode,
+        "Nomenclature": f"Work {workcode}",
+        "Allot No": f"AL/{i}",
+        "Allot Amt": float(rng.randrange(1, 50) * 100000),
+        "AAA No": f"AAA/{i}",
+        "AAA Amt": float(rng.randrange(50, 100) * 100000),
+        "TS No": f"TS/{i}",
+        "TS Amt": float(rng.randrange(50, 100) * 100000),
+    } for i, workcode in enumerate(workcodes)]).execute()
+
+    batch = []
+    for i in range(bills):
+        created_at = today - datetime.timedelta(seconds=rng.randrange(0, 5 * 365 * 86400))
+        billed = float(rng.randrange(1, 500) * 1000)
+        scheme = rng.choice(schemes)
+        rates = {
+            "income_tax_percent": rng.choice([1.0, 2.0, 2.24]),
+            "deposit_percent": 10,
+            "cess_percent": 1,
+            "cgst_percent": rng.choice([0, 1]),
+        }
+        rates["sgst_percent"] = rates["cgst_percent"]
+        deductions = calculate_deductions(billed, restricted_to_amount=billed, scheme=scheme, **rates)
+        batch.append({
+            "payee": rng.choice(payees),
+            "work": rng.choice(workcodes),
+            "bill_type": rng.choice(["Plan", "Non Plan"]),
+            "major_head": rng.choice(major_heads),
+            "scheme": scheme,
+            "billed_amount": billed,
+            "deduct_payments": 0.0,
+            "payable": billed,
+            "restricted_to_amount": billed,
+            **rates,
+            **dict(zip(DEDUCTION_AMOUNT_COLUMNS, deductions)),
+            "status": rng.choice(["Pending", "Pending", "Paid"]),
+            "cc_bill": "1st",
+            "final_bill": False,
+            "created_at": created_at.isoformat(),
+        })
+        if len(batch) == 1000:
+            client.table("bills").insert(batch).execute()
+            batch = []
+    if batch:
+        client.table("bills").insert(batch).execute()
+    rpc_rebuild_bills_rollup(client)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local SQLite backend utilities")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    seed_parser = subparsers.add_parser("seed", help="Create the schema and fill it with synthetic data")
+    seed_parser.add_argument("--path", default=os.getenv("SQLITE_PATH", "local.db"))
+    seed_parser.add_argument("--bills", type=int, default=1000)
+    seed_parser.add_argument("--contractors", type=int, default=200)
+    seed_parser.add_argument("--works", type=int, default=500)
+    args = parser.parse_args(argv)
+    load_dotenv() # ADMIN_USER / ADMIN_PASS for the seeded admin account
+
+    if args.command == "seed":
+        client = LocalClient(args.path)
+        seed(client, bills=args.bills, contractors=args.contractors, works=args.works)
+        print(f"Seeded {args.path} with {args.bills} bills.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Maintenance commands for the data layer.
+
+    python -m utils.maintenance rebuild-rollup
+    python -m utils.maintenance audit-deductions [--start YYYY-MM-DD] [--end YYYY-MM-DD] [--output FILE.csv]
+    python -m utils.maintenance archive-bills [--year YYYY ...] [--force]
+
+Uses the backend selected by DB_BACKEND, like the app.
+"""
+import argparse
+import datetime
+import pandas as pd
+from .archive import archive_fiscal_year, archive_path, UnsettledBillsError
+from .db import rebuild_bills_rollup, iter_bills, bills_frame
+from .helpers import audit_deductions, fiscal_year, fiscal_year_label, DEDUCTION_RATE_COLUMNS, DEDUCTION_AMOUNT_COLUMNS
+
+AUDIT_BATCH_SIZE = 10000
+
+
+def audit_bill_deductions(start_date=None, end_date=None):
+    """Recalculates the deductions of every stored bill; returns (bills checked, mismatch frame)."""
+    columns = ["bill_no", "restricted_to_amount", "scheme"] + DEDUCTION_RATE_COLUMNS + DEDUCTION_AMOUNT_COLUMNS
+    checked, mismatches = 0, []
+    for batch in iter_bills(columns, start_date, end_date, batch_size=AUDIT_BATCH_SIZE):
+        bills = bills_frame(batch)
+        checked += len(bills)
+        mismatched = audit_deductions(bills)
+        if not mismatched.empty:
+            mismatches.append(mismatched.merge(bills[["id", "bill_no", "created_at"]], on="id", how="left"))
+    if not mismatches:
+        return checked, pd.DataFrame(columns=["id", "column", "stored", "recalculated", "bill_no", "created_at"])
+    return checked, pd.concat(mismatches, ignore_index=True)
+
+
+def closed_fiscal_years():
+    """Fiscal years before the current one that still have bills in the database."""
+    first_batch = next(iter_bills(["id"], batch_size=1), [])
+    if not first_batch:
+        return []
+    first_year = fiscal_year(datetime.datetime.fromisoformat(str(first_batch[0]["created_at"])))
+    return list(range(first_year, fiscal_year(datetime.date.today())))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HydraulicUri data maintenance")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("rebuild-rollup", help="Recompute bills_daily_rollup from the bills table")
+    audit_parser = subparsers.add_parser("audit-deductions", help="Report bills whose stored deductions differ from a recalculation")
+    audit_parser.add_argument("--start", type=datetime.date.fromisoformat, help="First created_at date (inclusive)")
+    audit_parser.add_argument("--end", type=datetime.date.fromisoformat, help="Last created_at date (inclusive)")
+    audit_parser.add_argument("--output", help="Write the mismatches to this CSV file")
+    archive_parser = subparsers.add_parser("archive-bills", help="Move bills of closed fiscal years into Parquet files")
+    archive_parser.add_argument("--year", type=int, action="append",
+                                help="Fiscal year by its starting year (2023 for 2023-24); repeatable. Default: every closed year")
+    archive_parser.add_argument("--force", action="store_true", help="Archive years that still have Pending bills")
+    args = parser.parse_args(argv)
+
+    if args.command == "rebuild-rollup":
+        row_count = rebuild_bills_rollup()
+        print(f"bills_daily_rollup rebuilt: {row_count} rows.")
+    elif args.command == "audit-deductions":
+        checked, mismatches = audit_bill_deductions(args.start, args.end)
+        print(f"{checked} bills checked, {mismatches['id'].nunique()} with differing deductions.")
+        if args.output:
+            mismatches.to_csv(args.output, index=False)
+            print(f"Mismatches written to {args.output}.")
+    elif args.command == "archive-bills":
+        for year in args.year or closed_fiscal_years():
+            try:
+                moved = archive_fiscal_year(year, force=args.force)
+            except UnsettledBillsError as e:
+                print(f"{e} Skipped.")
+                continue
+            print(f"{fiscal_year_label(year)}: {moved} bills moved to {archive_path(year)}.")
+
+
+if __name__ == "__main__":
+    main()